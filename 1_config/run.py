@@ -4,8 +4,10 @@
 config.toml の内容を検証し、次工程で使用可能か確認する。
 """
 
+import re
 import sys
 from pathlib import Path
+from typing import Any
 
 # Python 3.11+ has tomllib built-in
 try:
@@ -17,6 +19,24 @@ except ImportError:
         print("Error: tomli が必要です。`uv add tomli` を実行してください。")
         sys.exit(1)
 
+# Optional: rtoml (Rust TOML parser, faster than tomllib)
+try:
+    import rtoml
+    HAS_RTOML = True
+except ImportError:
+    HAS_RTOML = False
+
+# バージョン文字列に数字が含まれるか
+_HAS_DIGIT = re.compile(r"\d").search
+
+
+def load_toml(path: Path) -> dict[str, Any]:
+    """Load a TOML file, using rtoml when installed."""
+    if HAS_RTOML:
+        return rtoml.load(path)
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
 
 def validate_config(config_path: Path) -> bool:
     """設定ファイルを検証"""
@@ -25,8 +45,7 @@ def validate_config(config_path: Path) -> bool:
         return False
 
     try:
-        with open(config_path, "rb") as f:
-            config = tomllib.load(f)
+        config = load_toml(config_path)
     except Exception as e:
         print(f"Error: TOML パースエラー: {e}")
         return False
@@ -60,10 +79,10 @@ def validate_config(config_path: Path) -> bool:
             valid = False
 
         # バージョン形式チェック
-        if current and not any(c.isdigit() for c in current):
+        if current and not _HAS_DIGIT(current):
             print(f"  ⚠️  current のバージョン形式が不正: {current}")
             valid = False
-        if target and not any(c.isdigit() for c in target):
+        if target and not _HAS_DIGIT(target):
             print(f"  ⚠️  target のバージョン形式が不正: {target}")
             valid = False
 
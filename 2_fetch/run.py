@@ -6,15 +6,24 @@
 複数ソースから取得し、構造化されたデータとして出力する。
 """
 
+from __future__ import annotations
+
 import argparse
+import atexit
+import hashlib
+import http.client
 import json
+import os
 import re
 import sys
-import urllib.request
-import urllib.error
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
+from html.parser import HTMLParser
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+from urllib.parse import urljoin, urlsplit
 
 # Python 3.11+ has tomllib built-in
 try:
@@ -26,6 +35,62 @@ except ImportError:
         print("Error: tomli が必要です。`uv add tomli` を実行してください。")
         sys.exit(1)
 
+# Optional: rtoml (Rust TOML parser, faster than tomllib)
+try:
+    import rtoml
+    HAS_RTOML = True
+except ImportError:
+    HAS_RTOML = False
+
+# Optional: orjson (Rust JSON serializer, faster than json)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Optional: httpx (HTTP/2 multiplexing when h2 is also installed)
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+try:
+    import h2  # noqa: F401
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
+
+# =============================================================================
+# Patterns
+# =============================================================================
+
+VERSION_DIGITS_RE = re.compile(r"\d+")
+SECTION_HEADER_RE = re.compile(r"^\d+\.\s*(.+)$")
+
+# UPGRADING section name keywords -> change type. Earlier keys take
+# precedence when a section name contains several of them.
+SECTION_TYPES: dict[str, str] = {
+    "backward incompatible": "breaking",
+    "deprecated": "deprecation",
+    "removed": "removed",
+    "new feature": "new",
+    "new function": "new",
+    "new class": "new",
+    "changed function": "breaking",
+}
+_SECTION_KEY_PRIORITY = {key: i for i, key in enumerate(SECTION_TYPES)}
+# Zero-width lookahead so overlapping keywords are all found in one scan
+SECTION_TYPE_RE = re.compile(
+    "(?=(" + "|".join(re.escape(key) for key in SECTION_TYPES) + "))"
+)
+
+# php.watch section headings
+DEPRECATED_HEADING_RE = re.compile(r"Deprecated", re.IGNORECASE)
+BREAKING_HEADING_RE = re.compile(r"Backward.?Incompatible", re.IGNORECASE)
+
 
 # =============================================================================
 # Version Utilities
@@ -34,7 +99,7 @@ except ImportError:
 def parse_version(version: str) -> tuple[int, ...]:
     """Parse version string to tuple of integers."""
     version = version.lstrip("^")
-    parts = re.findall(r"\d+", version)
+    parts = VERSION_DIGITS_RE.findall(version)
     return tuple(int(p) for p in parts)
 
 
@@ -50,6 +115,237 @@ def get_target_versions(current: str, target: str) -> list[str]:
     return versions
 
 
+# =============================================================================
+# TOML
+# =============================================================================
+
+def load_toml(path: Path) -> dict[str, Any]:
+    """Load a TOML file, using rtoml when installed."""
+    if HAS_RTOML:
+        return rtoml.load(path)
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+# =============================================================================
+# Logging
+# =============================================================================
+
+# Per-thread log buffer, set while a fetch task runs on a worker thread
+_log_state = threading.local()
+
+
+def log(message: str) -> None:
+    """Print a progress message to stderr, or buffer it inside a fetch task."""
+    buffer = getattr(_log_state, "buffer", None)
+    if buffer is None:
+        print(message, file=sys.stderr)
+    else:
+        buffer.append(message)
+
+
+# =============================================================================
+# HTTP Client
+# =============================================================================
+# The HTTP client, HTTP cache and PhpWatchParser are also copied into
+# legacy/mw_upgrade_check.py, which is kept standalone on purpose (it is
+# installed on its own as mw-upgrade-check). Keep the copies in sync.
+
+USER_AGENT = "mw-upgrade-check/1.0"
+HTTP_TIMEOUT = 30
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+# Larger responses are rejected rather than held in memory (pages are ~100 KB)
+MAX_RESPONSE_BYTES = 8 * 1024 * 1024
+
+# Exceptions raised by http_get on network failure
+HTTP_ERRORS: tuple[type[Exception], ...] = (OSError, http.client.HTTPException)
+if HAS_HTTPX:
+    HTTP_ERRORS += (httpx.HTTPError,)
+
+# Shared httpx client (thread-safe; one multiplexed connection per host over HTTP/2)
+_httpx_client: "httpx.Client | None" = None
+
+# Idle keep-alive connections, keyed by (scheme, host)
+_connection_pool: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+_pool_lock = threading.Lock()
+
+
+def _new_connection(scheme: str, host: str) -> http.client.HTTPConnection:
+    """Open a new connection to the host."""
+    if scheme == "https":
+        return http.client.HTTPSConnection(host, timeout=HTTP_TIMEOUT)
+    return http.client.HTTPConnection(host, timeout=HTTP_TIMEOUT)
+
+
+def _acquire_connection(scheme: str, host: str) -> tuple[http.client.HTTPConnection, bool]:
+    """Take an idle connection from the pool, or open a new one.
+
+    Returns:
+        tuple: (connection, whether it was reused from the pool)
+    """
+    with _pool_lock:
+        idle = _connection_pool.get((scheme, host))
+        if idle:
+            return idle.pop(), True
+    return _new_connection(scheme, host), False
+
+
+def _release_connection(scheme: str, host: str, conn: http.client.HTTPConnection) -> None:
+    """Return a connection to the pool for reuse."""
+    with _pool_lock:
+        _connection_pool.setdefault((scheme, host), []).append(conn)
+
+
+def close_connections() -> None:
+    """Close all idle pooled connections."""
+    global _httpx_client
+    with _pool_lock:
+        for conns in _connection_pool.values():
+            for conn in conns:
+                conn.close()
+        _connection_pool.clear()
+        if _httpx_client is not None:
+            _httpx_client.close()
+            _httpx_client = None
+
+
+def _get_httpx_client() -> "httpx.Client":
+    """Create the shared httpx client on first use."""
+    global _httpx_client
+    with _pool_lock:
+        if _httpx_client is None:
+            _httpx_client = httpx.Client(
+                http2=HAS_H2,
+                timeout=HTTP_TIMEOUT,
+                headers={"User-Agent": USER_AGENT},
+                follow_redirects=True,
+                max_redirects=MAX_REDIRECTS,
+            )
+        return _httpx_client
+
+
+def http_get(
+    url: str, extra_headers: dict[str, str] | None = None
+) -> tuple[int, str, dict[str, str]]:
+    """GET a URL, reusing connections per host.
+
+    Uses httpx (HTTP/2 if h2 is installed) when available, otherwise
+    http.client with a keep-alive pool. Bodies are read up to
+    MAX_RESPONSE_BYTES; a larger response raises http.client.HTTPException.
+
+    Returns:
+        tuple: (HTTP status code, decoded body, response headers with lowercase names)
+    """
+    if HAS_HTTPX:
+        with _get_httpx_client().stream("GET", url, headers=extra_headers) as response:
+            body = bytearray()
+            for chunk in response.iter_bytes():
+                body += chunk
+                if len(body) > MAX_RESPONSE_BYTES:
+                    raise http.client.HTTPException(f"Response too large: {url}")
+            return response.status_code, body.decode("utf-8", errors="replace"), dict(response.headers)
+
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+        headers = {"User-Agent": USER_AGENT, **(extra_headers or {})}
+
+        conn, reused = _acquire_connection(parts.scheme, parts.netloc)
+        try:
+            try:
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not reused:
+                    raise
+                # The server dropped the idle connection; retry once on a fresh one
+                conn.close()
+                conn = _new_connection(parts.scheme, parts.netloc)
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+            body = response.read(MAX_RESPONSE_BYTES + 1)
+            if len(body) > MAX_RESPONSE_BYTES:
+                raise http.client.HTTPException(f"Response too large: {url}")
+        except Exception:
+            conn.close()
+            raise
+
+        if response.will_close:
+            conn.close()
+        else:
+            _release_connection(parts.scheme, parts.netloc, conn)
+
+        location = response.getheader("Location")
+        if response.status in REDIRECT_STATUSES and location:
+            url = urljoin(url, location)
+            continue
+
+        response_headers = {name.lower(): value for name, value in response.getheaders()}
+        return response.status, body.decode("utf-8", errors="replace"), response_headers
+
+    raise http.client.HTTPException(f"Too many redirects: {url}")
+
+
+# =============================================================================
+# HTTP Cache (ETag / Last-Modified)
+# =============================================================================
+
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "mw-auto-updater"
+
+
+def _cache_path(url: str) -> Path:
+    """Cache file for a URL."""
+    return CACHE_DIR / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+
+def cached_get(url: str) -> tuple[int, str]:
+    """GET a URL, revalidating a disk-cached copy with a conditional request.
+
+    The cached body is reused when the server answers 304 Not Modified.
+
+    Returns:
+        tuple: (HTTP status code, decoded body)
+    """
+    cache_file = _cache_path(url)
+    cached = None
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        pass
+    # A copy without a body cannot be reused: fetch unconditionally
+    if not isinstance(cached, dict) or not isinstance(cached.get("body"), str):
+        cached = None
+
+    request_headers = {}
+    if cached:
+        if isinstance(cached.get("etag"), str):
+            request_headers["If-None-Match"] = cached["etag"]
+        if isinstance(cached.get("last_modified"), str):
+            request_headers["If-Modified-Since"] = cached["last_modified"]
+
+    status, body, headers = http_get(url, request_headers)
+    if status == 304 and cached:
+        return 200, cached["body"]
+
+    etag = headers.get("etag")
+    last_modified = headers.get("last-modified")
+    if status == 200 and (etag or last_modified):
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"url": url, "etag": etag, "last_modified": last_modified, "body": body}, f)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            log(f"  [cache] Could not write {cache_file}: {e}")
+
+    return status, body
+
+
 # =============================================================================
 # Source: GitHub (php/php-src UPGRADING)
 # =============================================================================
@@ -59,34 +355,42 @@ def fetch_github_upgrading(version: str) -> list[dict[str, Any]]:
     branch = f"PHP-{version}"
     url = f"https://raw.githubusercontent.com/php/php-src/{branch}/UPGRADING"
 
-    changes = []
-
     try:
-        req = urllib.request.Request(
-            url,
-            headers={"User-Agent": "mw-upgrade-check/1.0"}
-        )
-        with urllib.request.urlopen(req, timeout=30) as response:
-            content = response.read().decode("utf-8")
-            changes = parse_upgrading_content(content, version, url)
-
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
-            print(f"  [github] Branch {branch} not found, trying master...", file=sys.stderr)
-            try:
-                url = "https://raw.githubusercontent.com/php/php-src/master/UPGRADING"
-                req = urllib.request.Request(url, headers={"User-Agent": "mw-upgrade-check/1.0"})
-                with urllib.request.urlopen(req, timeout=30) as response:
-                    content = response.read().decode("utf-8")
-                    changes = parse_upgrading_content(content, version, url)
-            except urllib.error.URLError as e2:
-                print(f"  [github] Error: {e2}", file=sys.stderr)
-        else:
-            print(f"  [github] HTTP Error: {e}", file=sys.stderr)
-    except urllib.error.URLError as e:
-        print(f"  [github] Error: {e}", file=sys.stderr)
+        status, content = cached_get(url)
+        if status == 404:
+            log(f"  [github] Branch {branch} not found, trying master...")
+            url = "https://raw.githubusercontent.com/php/php-src/master/UPGRADING"
+            status, content = cached_get(url)
 
-    return changes
+        if status != 200:
+            log(f"  [github] HTTP Error {status}: {url}")
+            return []
+
+        return parse_upgrading_content(content, version, url)
+
+    except HTTP_ERRORS as e:
+        log(f"  [github] Error: {e}")
+        return []
+
+
+def iter_lines(content: str) -> Iterator[str]:
+    """Yield the lines of content lazily, without building a list."""
+    start = 0
+    while True:
+        end = content.find("\n", start)
+        if end < 0:
+            yield content[start:]
+            return
+        yield content[start:end]
+        start = end + 1
+
+
+def section_type(section_name: str) -> str | None:
+    """Map a lowercased UPGRADING section name to its change type."""
+    keys = SECTION_TYPE_RE.findall(section_name)
+    if not keys:
+        return None
+    return SECTION_TYPES[min(keys, key=_SECTION_KEY_PRIORITY.__getitem__)]
 
 
 def parse_upgrading_content(content: str, version: str, url: str) -> list[dict[str, Any]]:
@@ -95,43 +399,29 @@ def parse_upgrading_content(content: str, version: str, url: str) -> list[dict[s
     current_section = None
     current_subsection = None
 
-    section_types = {
-        "backward incompatible": "breaking",
-        "deprecated": "deprecation",
-        "removed": "removed",
-        "new feature": "new",
-        "new function": "new",
-        "new class": "new",
-        "changed function": "breaking",
-    }
-
-    lines = content.split("\n")
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
+    # Single forward pass with one line of lookahead for continuation lines
+    lines = iter_lines(content)
+    next_line = next(lines, None)
+    while next_line is not None:
+        line = next_line.strip()
+        next_line = next(lines, None)
 
-        section_match = re.match(r"^\d+\.\s*(.+)$", line)
+        section_match = SECTION_HEADER_RE.match(line)
         if section_match:
-            section_name = section_match.group(1).lower()
-            current_section = None
-            for key, change_type in section_types.items():
-                if key in section_name:
-                    current_section = change_type
-                    break
-            i += 1
+            current_section = section_type(section_match.group(1).lower())
             continue
 
         if line.startswith("- ") and line.endswith(":"):
             current_subsection = line[2:-1]
-            i += 1
             continue
 
         if current_section and line.startswith("- "):
-            description = line[2:].strip()
-
-            while i + 1 < len(lines) and lines[i + 1].startswith("  "):
-                i += 1
-                description += " " + lines[i].strip()
+            # Gather the indented continuation run, then join once
+            parts = [line[2:].strip()]
+            while next_line is not None and next_line.startswith("  "):
+                parts.append(next_line.strip())
+                next_line = next(lines, None)
+            description = " ".join(parts)
 
             if len(description) > 10:
                 change = {
@@ -145,8 +435,6 @@ def parse_upgrading_content(content: str, version: str, url: str) -> list[dict[s
                     change["category"] = current_subsection.lower()
                 changes.append(change)
 
-        i += 1
-
     return changes
 
 
@@ -154,55 +442,84 @@ def parse_upgrading_content(content: str, version: str, url: str) -> list[dict[s
 # Source: php.watch
 # =============================================================================
 
+class PhpWatchParser(HTMLParser):
+    """Collect list items grouped by the <h2>/<h3> heading they follow."""
+
+    HEADING_TAGS = ("h2", "h3")
+
+    def __init__(self):
+        super().__init__()
+        self.sections: list[tuple[str, list[str]]] = []
+        self._heading: list[str] | None = None
+        self._item: list[str] | None = None
+        self._item_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in self.HEADING_TAGS:
+            self._heading = []
+        elif tag == "li":
+            # Nested <li> text is folded into the outermost item
+            if self._item is None:
+                self._item = []
+            self._item_depth += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self.HEADING_TAGS and self._heading is not None:
+            self.sections.append((_collapse_whitespace(self._heading), []))
+            self._heading = None
+        elif tag == "li" and self._item is not None:
+            self._item_depth -= 1
+            if self._item_depth == 0:
+                if self.sections:
+                    self.sections[-1][1].append(_collapse_whitespace(self._item))
+                self._item = None
+
+    def handle_data(self, data: str) -> None:
+        if self._heading is not None:
+            self._heading.append(data)
+        elif self._item is not None:
+            self._item.append(data)
+
+
+def _collapse_whitespace(parts: list[str]) -> str:
+    """Join text fragments and collapse runs of whitespace."""
+    return " ".join("".join(parts).split())
+
+
 def fetch_phpwatch(version: str) -> list[dict[str, Any]]:
     """Fetch PHP changes from php.watch."""
     url = f"https://php.watch/versions/{version}"
     changes = []
 
     try:
-        req = urllib.request.Request(
-            url,
-            headers={"User-Agent": "mw-upgrade-check/1.0"}
-        )
-        with urllib.request.urlopen(req, timeout=30) as response:
-            html = response.read().decode("utf-8")
-
-            # Extract deprecations
-            deprecation_section = re.search(
-                r"Deprecated.*?(?=<h[23]|$)", html, re.DOTALL | re.IGNORECASE
-            )
-            if deprecation_section:
-                items = re.findall(r"<li[^>]*>([^<]+(?:<[^>]+>[^<]*)*)</li>", deprecation_section.group())
-                for item in items[:20]:
-                    clean = re.sub(r"<[^>]+>", "", item).strip()
-                    if len(clean) > 10 and len(clean) < 300:
-                        changes.append({
-                            "version": version,
-                            "type": "deprecation",
-                            "description": clean,
-                            "source": "php.watch",
-                            "source_url": url,
-                        })
-
-            # Extract breaking changes
-            breaking_section = re.search(
-                r"Backward.?Incompatible.*?(?=<h[23]|$)", html, re.DOTALL | re.IGNORECASE
-            )
-            if breaking_section:
-                items = re.findall(r"<li[^>]*>([^<]+(?:<[^>]+>[^<]*)*)</li>", breaking_section.group())
-                for item in items[:20]:
-                    clean = re.sub(r"<[^>]+>", "", item).strip()
-                    if len(clean) > 10 and len(clean) < 300:
+        status, html = cached_get(url)
+        if status != 200:
+            log(f"  [php.watch] HTTP Error {status}: {url}")
+            return changes
+
+        parser = PhpWatchParser()
+        parser.feed(html)
+        parser.close()
+
+        for heading_re, change_type in (
+            (DEPRECATED_HEADING_RE, "deprecation"),
+            (BREAKING_HEADING_RE, "breaking"),
+        ):
+            for heading, items in parser.sections:
+                if not heading_re.search(heading):
+                    continue
+                for item in items:
+                    if len(item) > 10 and len(item) < 300:
                         changes.append({
                             "version": version,
-                            "type": "breaking",
-                            "description": clean,
+                            "type": change_type,
+                            "description": item,
                             "source": "php.watch",
                             "source_url": url,
                         })
 
-    except urllib.error.URLError as e:
-        print(f"  [php.watch] Error fetching {url}: {e}", file=sys.stderr)
+    except HTTP_ERRORS as e:
+        log(f"  [php.watch] Error fetching {url}: {e}")
 
     return changes
 
@@ -215,53 +532,98 @@ def load_local_toml(version: str, data_dir: Path) -> list[dict[str, Any]]:
     """Load changes from local TOML file."""
     file_path = data_dir / f"php-{version}-changes.toml"
     if not file_path.exists():
-        print(f"  [local] File not found: {file_path}", file=sys.stderr)
+        log(f"  [local] File not found: {file_path}")
         return []
 
-    print(f"  [local] Loading {file_path.name}", file=sys.stderr)
+    log(f"  [local] Loading {file_path.name}")
 
-    with open(file_path, "rb") as f:
-        data = tomllib.load(f)
-        changes = data.get("changes", [])
-        for change in changes:
-            change["version"] = version
-            change["source"] = "local"
-            change["source_file"] = str(file_path.name)
-        return changes
+    data = load_toml(file_path)
+    changes = data.get("changes", [])
+    for change in changes:
+        change["version"] = version
+        change["source"] = "local"
+        change["source_file"] = str(file_path.name)
+    return changes
 
 
 # =============================================================================
 # Fetch Logic
 # =============================================================================
 
+FETCH_WORKERS = 8
+
+
+def fetch_source_version(source: str, version: str, data_dir: Path) -> list[dict[str, Any]]:
+    """Fetch changes from a specific source for a single version."""
+    if source == "github":
+        return fetch_github_upgrading(version)
+    elif source == "php.watch":
+        return fetch_phpwatch(version)
+    elif source == "local":
+        return load_local_toml(version, data_dir)
+    else:
+        log(f"  Unknown source: {source}")
+        return []
+
+
+def fetch_task(
+    source: str,
+    version: str,
+    data_dir: Path
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Fetch a single (source, version) pair, buffering its log output.
+
+    Returns:
+        tuple: (list of changes, buffered log lines)
+    """
+    _log_state.buffer = buffer = []
+    try:
+        log(f"  Fetching {source} for version {version}...")
+        changes = fetch_source_version(source, version, data_dir)
+        log(f"    Found {len(changes)} changes")
+    finally:
+        _log_state.buffer = None
+    return changes, buffer
+
+
 def fetch_changes_by_source(
     source: str,
     versions: list[str],
-    data_dir: Path
+    data_dir: Path,
+    pending: dict[tuple[str, str], Future] | None = None
 ) -> dict[str, Any]:
-    """Fetch changes from a specific source for all versions."""
+    """Fetch changes from a specific source for all versions.
+
+    Versions already submitted to a thread pool are taken from `pending`;
+    the rest are fetched on the calling thread. Logs are printed in version order.
+    """
+    pending = pending or {}
     all_changes = []
 
     for version in versions:
-        print(f"  Fetching {source} for version {version}...", file=sys.stderr)
-        if source == "github":
-            changes = fetch_github_upgrading(version)
-        elif source == "php.watch":
-            changes = fetch_phpwatch(version)
-        elif source == "local":
-            changes = load_local_toml(version, data_dir)
+        future = pending.get((source, version))
+        if future is not None:
+            changes, log_lines = future.result()
         else:
-            print(f"  Unknown source: {source}", file=sys.stderr)
-            changes = []
+            changes, log_lines = fetch_task(source, version, data_dir)
 
+        for line in log_lines:
+            print(line, file=sys.stderr)
         all_changes.extend(changes)
-        print(f"    Found {len(changes)} changes", file=sys.stderr)
 
-    # Categorize
-    breaking = [c for c in all_changes if c.get("type") == "breaking"]
-    deprecations = [c for c in all_changes if c.get("type") == "deprecation"]
-    removed = [c for c in all_changes if c.get("type") == "removed"]
-    new_features = [c for c in all_changes if c.get("type") == "new"]
+    # Categorize in a single pass
+    buckets: dict[str, list[dict[str, Any]]] = {
+        "breaking": [], "deprecation": [], "removed": [], "new": [],
+    }
+    for change in all_changes:
+        bucket = buckets.get(change.get("type"))
+        if bucket is not None:
+            bucket.append(change)
+
+    breaking = buckets["breaking"]
+    deprecations = buckets["deprecation"]
+    removed = buckets["removed"]
+    new_features = buckets["new"]
 
     return {
         "source": source,
@@ -293,11 +655,21 @@ def fetch_php_changes(
         sources = [s for s in sources if s == "local"]
         print(f"[--no-web] Using only local sources", file=sys.stderr)
 
-    results_by_source = []
-    for source in sources:
-        print(f"\nFetching from {source}...", file=sys.stderr)
-        result = fetch_changes_by_source(source, versions, data_dir)
-        results_by_source.append(result)
+    # Network fetches for every (source, version) run concurrently;
+    # local files are cheap and are read on the main thread.
+    tasks = [(source, version) for source in sources if source != "local" for version in versions]
+
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        pending = {
+            (source, version): executor.submit(fetch_task, source, version, data_dir)
+            for source, version in tasks
+        }
+
+        results_by_source = []
+        for source in sources:
+            print(f"\nFetching from {source}...", file=sys.stderr)
+            result = fetch_changes_by_source(source, versions, data_dir, pending)
+            results_by_source.append(result)
 
     return {
         "middleware": "php",
@@ -312,6 +684,43 @@ def fetch_php_changes(
 # Output Formatting
 # =============================================================================
 
+def write_json(path: Path, data: Any) -> None:
+    """Write data as indented UTF-8 JSON, using orjson when installed."""
+    if HAS_ORJSON:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+# Category names repeat across changes; title-case each one once
+_title = lru_cache(maxsize=256)(str.title)
+
+
+def _append_change_detail(lines: list[str], change: dict[str, Any]) -> None:
+    """Append a breaking change / deprecation entry as a markdown section."""
+    version = change.get("version", "?")
+    category = _title(change.get("category", "general"))
+    description_ja = change.get("description_ja")
+    pattern = change.get("pattern")
+    replacement = change.get("replacement")
+
+    lines.append(f"### [{version}] {category}")
+    lines.append("")
+    lines.append(change["description"])
+    if description_ja:
+        lines.append("")
+        lines.append(f"> {description_ja}")
+    if pattern:
+        lines.append("")
+        lines.append(f"**Pattern**: `{pattern}`")
+    if replacement:
+        lines.append("")
+        lines.append(f"**Replacement**: {replacement}")
+    lines.append("")
+
+
 def format_markdown_output(result: dict[str, Any], timestamp: str) -> str:
     """Format results as human-readable markdown."""
     lines = []
@@ -344,37 +753,13 @@ def format_markdown_output(result: dict[str, Any], timestamp: str) -> str:
             lines.append(f"## Breaking Changes ({source_name})")
             lines.append("")
             for change in source_result["breaking_changes"]:
-                lines.append(f"### [{change.get('version', '?')}] {change.get('category', 'general').title()}")
-                lines.append("")
-                lines.append(f"{change['description']}")
-                if change.get("description_ja"):
-                    lines.append(f"")
-                    lines.append(f"> {change['description_ja']}")
-                if change.get("pattern"):
-                    lines.append(f"")
-                    lines.append(f"**Pattern**: `{change['pattern']}`")
-                if change.get("replacement"):
-                    lines.append(f"")
-                    lines.append(f"**Replacement**: {change['replacement']}")
-                lines.append("")
+                _append_change_detail(lines, change)
 
         if source_result["deprecations"]:
             lines.append(f"## Deprecations ({source_name})")
             lines.append("")
             for change in source_result["deprecations"]:
-                lines.append(f"### [{change.get('version', '?')}] {change.get('category', 'general').title()}")
-                lines.append("")
-                lines.append(f"{change['description']}")
-                if change.get("description_ja"):
-                    lines.append(f"")
-                    lines.append(f"> {change['description_ja']}")
-                if change.get("pattern"):
-                    lines.append(f"")
-                    lines.append(f"**Pattern**: `{change['pattern']}`")
-                if change.get("replacement"):
-                    lines.append(f"")
-                    lines.append(f"**Replacement**: {change['replacement']}")
-                lines.append("")
+                _append_change_detail(lines, change)
 
         if source_result["removed"]:
             lines.append(f"## Removed Features ({source_name})")
@@ -401,8 +786,7 @@ def format_markdown_output(result: dict[str, Any], timestamp: str) -> str:
 
 def load_config(config_path: Path) -> dict[str, Any]:
     """Load TOML configuration file."""
-    with open(config_path, "rb") as f:
-        return tomllib.load(f)
+    return load_toml(config_path)
 
 
 def main():
@@ -427,6 +811,8 @@ def main():
 
     args = parser.parse_args()
 
+    atexit.register(close_connections)
+
     # Resolve paths
     script_dir = Path(__file__).parent.resolve()
     config_path = Path(args.config)
@@ -465,6 +851,7 @@ def main():
     # Process each middleware
     results = []
     output_files = []
+    total_changes = 0
 
     for mw in config.get("middleware", []):
         name = mw.get("name", "").lower()
@@ -498,11 +885,11 @@ def main():
         result["fetch_timestamp"] = fetch_timestamp
 
         results.append(result)
+        total_changes += sum(s["summary"]["total"] for s in result.get("sources", []))
 
         # Write JSON output
         json_file = output_dir / f"changes-{name}-{timestamp}.json"
-        with open(json_file, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        write_json(json_file, result)
         output_files.append(json_file)
         print(f"\nJSON output: {json_file}", file=sys.stderr)
 
@@ -520,10 +907,6 @@ def main():
     print("=" * 60, file=sys.stderr)
 
     if results:
-        total_changes = sum(
-            sum(s["summary"]["total"] for s in r.get("sources", []))
-            for r in results
-        )
         print(f"\n取得した変更: {total_changes} 件", file=sys.stderr)
         print(f"出力ファイル:", file=sys.stderr)
         for f in output_files:
@@ -7,16 +7,26 @@
 """
 
 import argparse
+import asyncio
+import base64
 import glob as glob_module
+import hashlib
 import json
+import mmap
 import os
 import re
+import shutil
 import subprocess
 import sys
+import time
+from array import array
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 # Optional: anthropic SDK
 try:
@@ -25,6 +35,20 @@ try:
 except ImportError:
     HAS_ANTHROPIC = False
 
+# Optional: h2 (lets the API client use HTTP/2)
+try:
+    import h2  # noqa: F401
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
+# Optional: orjson (Rust JSON parser/serializer, faster than json)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 # =============================================================================
 # Configuration
@@ -98,6 +122,32 @@ EXT_TO_LANGUAGE: dict[str, str] = {
     "css": "css",
 }
 
+# ripgrep binary, if installed (falls back to grep)
+RIPGREP = shutil.which("rg")
+
+SEARCH_TIMEOUT = 60
+# Context lines kept before/after each match (prompts and reports use at most 3)
+CONTEXT_LINES = 3
+# Patterns that need their own search run this many at a time
+SEARCH_WORKERS = os.cpu_count() or 4
+
+# Claude API
+AI_MODEL = "claude-sonnet-4-20250514"
+AI_MAX_TOKENS = 2000
+# Maximum number of API requests in flight at once
+AI_CONCURRENCY = 8
+# Batched analysis (--ai-batch): estimated input tokens / changes per request
+AI_BATCH_TOKENS = 60_000
+AI_BATCH_MAX_ITEMS = 8
+AI_BATCH_MAX_OUTPUT_TOKENS = 16_000
+
+# Patterns made only of ordinary characters and escaped punctuation are literals
+LITERAL_PATTERN_RE = re.compile(r"(?:[^\\.^$*+?()\[\]{}|]|\\[^\w\s])+")
+ESCAPED_CHAR_RE = re.compile(r"\\(.)")
+
+# POSIX bracket classes ([:alpha:] etc.), which Python's re does not support
+POSIX_CLASS_RE = re.compile(r"\[:[a-z]+:\]")
+
 
 # =============================================================================
 # Data Classes
@@ -120,36 +170,77 @@ class ImpactResult:
     matches: list[CodeMatch]
     ai_analysis: str = ""
     affected_files: list[str] = field(default_factory=list)
+    # Matches grouped by file, in first-seen order
+    files_matches: dict[str, list[CodeMatch]] = field(default_factory=dict)
 
 
 # =============================================================================
 # Utility Functions
 # =============================================================================
 
-def get_file_language(file_path: str) -> str:
-    """Get code block language from file extension."""
-    path = Path(file_path)
-    name = path.name
-    # Handle compound extensions like .blade.php
-    for ext, lang in EXT_TO_LANGUAGE.items():
-        if name.endswith(f".{ext}"):
+# Longest extension first, so compound extensions like .blade.php win over .php
+_EXT_BY_LENGTH: tuple[tuple[str, str], ...] = tuple(
+    sorted(EXT_TO_LANGUAGE.items(), key=lambda item: len(item[0]), reverse=True)
+)
+
+
+@lru_cache(maxsize=None)
+def _lang_for_suffix(suffix: str) -> str:
+    """Get code block language for a file's trailing extension(s), e.g. "blade.php"."""
+    dotted = f".{suffix}"
+    for ext, lang in _EXT_BY_LENGTH:
+        if dotted.endswith(f".{ext}"):
             return lang
-    # Fallback to simple extension
-    ext = path.suffix.lstrip(".")
-    return EXT_TO_LANGUAGE.get(ext, "")
+    return ""
+
+
+@lru_cache(maxsize=4096)
+def get_file_language(file_path: str) -> str:
+    """Get code block language from file extension (cached per path)."""
+    # Keep up to two extensions to handle compound extensions like .blade.php
+    parts = Path(file_path).name.rsplit(".", 2)
+    return _lang_for_suffix(".".join(parts[1:]))
+
+
+@lru_cache(maxsize=128)
+def _line_index(file_path: str) -> tuple[bytes | mmap.mmap, array]:
+    """Map a file into memory and index where each line starts (cached across matches).
+
+    Returns:
+        tuple: (file contents, byte offsets of line starts followed by the end offset)
+    """
+    with open(file_path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            data = b""
+
+    bounds = array("q", [0])
+    find = data.find
+    pos = find(b"\n")
+    while pos >= 0:
+        bounds.append(pos + 1)
+        pos = find(b"\n", pos + 1)
+    if bounds[-1] != len(data):
+        bounds.append(len(data))
+
+    return data, bounds
 
 
 def get_context(file_path: str, line_number: int, context_lines: int) -> tuple[list[str], list[str]]:
     """Get lines before and after the match."""
     try:
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            lines = f.readlines()
+        data, bounds = _line_index(file_path)
+
+        def line_at(index: int) -> str:
+            return data[bounds[index]:bounds[index + 1]].decode("utf-8", errors="ignore").rstrip()
 
         start = max(0, line_number - context_lines - 1)
-        end = min(len(lines), line_number + context_lines)
+        end = min(len(bounds) - 1, line_number + context_lines)
 
-        before = [l.rstrip() for l in lines[start:line_number - 1]]
-        after = [l.rstrip() for l in lines[line_number:end]]
+        before = [line_at(i) for i in range(start, line_number - 1)]
+        after = [line_at(i) for i in range(line_number, end)]
 
         return before, after
     except Exception:
@@ -160,64 +251,182 @@ def get_context(file_path: str, line_number: int, context_lines: int) -> tuple[l
 # Search Functions
 # =============================================================================
 
+def pattern_literal(pattern: str) -> str | None:
+    """Return the plain string a pattern matches if it has no regex operators.
+
+    Escaped punctuation such as `each\\(` is treated as the literal character.
+    """
+    if not LITERAL_PATTERN_RE.fullmatch(pattern):
+        return None
+    return ESCAPED_CHAR_RE.sub(r"\1", pattern)
+
+
+def _rg_text(value: dict[str, str]) -> str:
+    """Decode a ripgrep JSON text value ({"text": ...} or {"bytes": base64})."""
+    if "text" in value:
+        return value["text"]
+    return base64.b64decode(value["bytes"]).decode("utf-8", errors="ignore")
+
+
+def _search_with_ripgrep(
+    codebase_path: Path,
+    patterns: list[str],
+    extensions: list[str],
+    fixed_strings: bool = False
+) -> list[tuple[str, int, str]] | None:
+    """Search with `rg --json`, matching lines that match any of the patterns.
+
+    With fixed_strings, the patterns are plain literals (`-F`).
+
+    Returns:
+        list of (file, line number, line content), or None if ripgrep
+        rejected a pattern and the caller should fall back to grep
+    """
+    # --engine auto: switch to PCRE2 (JIT-compiled) for patterns that need
+    # look-around or backreferences, keep the default engine otherwise
+    rg_cmd = [RIPGREP, "--json", "--engine", "auto"]
+    if fixed_strings:
+        rg_cmd.append("-F")
+    for pattern in patterns:
+        rg_cmd.extend(["-e", pattern])
+    for ext in extensions:
+        rg_cmd.extend(["-g", f"*.{ext}"])
+    rg_cmd.append(str(codebase_path))
+
+    result = subprocess.run(rg_cmd, capture_output=True, text=True, timeout=SEARCH_TIMEOUT)
+
+    hits = []
+    for line in result.stdout.splitlines():
+        event = json.loads(line)
+        if event.get("type") != "match":
+            continue
+        data = event["data"]
+        hits.append((
+            _rg_text(data["path"]),
+            data["line_number"],
+            _rg_text(data["lines"]).rstrip("\r\n"),
+        ))
+
+    # Exit code 2 without any hits means the search itself failed
+    # (typically a pattern ripgrep's regex engine does not support)
+    if result.returncode == 2 and not hits:
+        return None
+
+    return hits
+
+
+def _search_with_grep(
+    codebase_path: Path,
+    patterns: list[str],
+    extensions: list[str],
+    fixed_strings: bool = False
+) -> list[tuple[str, int, str]] | None:
+    """Search with `grep -rn -E`, matching lines that match any of the patterns.
+
+    With fixed_strings, the patterns are plain literals (`-F`).
+
+    Returns:
+        list of (file, line number, line content), or None if grep
+        rejected a pattern
+    """
+    grep_cmd = ["grep", "-rn", "-F" if fixed_strings else "-E"]
+    for ext in extensions:
+        grep_cmd.append(f"--include=*.{ext}")
+    for pattern in patterns:
+        grep_cmd.extend(["-e", pattern])
+    grep_cmd.append(str(codebase_path))
+
+    result = subprocess.run(grep_cmd, capture_output=True, text=True, timeout=SEARCH_TIMEOUT)
+
+    hits = []
+    for line in result.stdout.strip().split("\n"):
+        if not line:
+            continue
+
+        # Parse grep output: file:line:content
+        parts = line.split(":", 2)
+        if len(parts) >= 3:
+            try:
+                line_number = int(parts[1])
+            except ValueError:
+                continue
+            hits.append((parts[0], line_number, parts[2].rstrip("\r")))
+
+    if result.returncode == 2 and not hits:
+        return None
+
+    return hits
+
+
+def _search_lines(
+    codebase_path: Path,
+    patterns: list[str],
+    middleware: str,
+    fixed_strings: bool = False
+) -> list[tuple[str, int, str]] | None:
+    """Run one ripgrep (or grep) search for lines matching any of the patterns.
+
+    Returns:
+        sorted list of (file, line number, line content), or None if
+        neither tool accepted the patterns
+    """
+    # Get file extensions for this middleware
+    extensions = MIDDLEWARE_FILE_EXTENSIONS.get(
+        middleware.lower(),
+        MIDDLEWARE_FILE_EXTENSIONS["default"]
+    )
+
+    hits = None
+    if RIPGREP:
+        hits = _search_with_ripgrep(codebase_path, patterns, extensions, fixed_strings)
+    if hits is None:
+        hits = _search_with_grep(codebase_path, patterns, extensions, fixed_strings)
+    if hits is None:
+        return None
+
+    # Sort for a stable report order (ripgrep searches files in parallel)
+    return sorted(hits)
+
+
+def _build_match(
+    file_path: str,
+    line_number: int,
+    line_content: str,
+    context_lines: int
+) -> CodeMatch:
+    """Build a CodeMatch with surrounding context lines."""
+    context_before, context_after = get_context(file_path, line_number, context_lines)
+    return CodeMatch(
+        file_path=file_path,
+        line_number=line_number,
+        line_content=line_content.strip(),
+        context_before=context_before,
+        context_after=context_after
+    )
+
+
 def search_codebase(
     codebase_path: Path,
     pattern: str,
     middleware: str = "default",
-    context_lines: int = 5
+    context_lines: int = CONTEXT_LINES
 ) -> list[CodeMatch]:
-    """Search codebase for pattern matches using grep."""
+    """Search codebase for pattern matches using ripgrep (or grep if unavailable)."""
     matches = []
 
     if not pattern:
         return matches
 
-    # Get file extensions for this middleware
-    extensions = MIDDLEWARE_FILE_EXTENSIONS.get(
-        middleware.lower(),
-        MIDDLEWARE_FILE_EXTENSIONS["default"]
-    )
-
-    # Build grep command with middleware-specific extensions
-    grep_cmd = ["grep", "-rn", "-E"]
-    for ext in extensions:
-        grep_cmd.append(f"--include=*.{ext}")
-    grep_cmd.extend([pattern, str(codebase_path)])
+    literal = pattern_literal(pattern)
 
     try:
-        result = subprocess.run(
-            grep_cmd,
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-
-        for line in result.stdout.strip().split("\n"):
-            if not line:
-                continue
+        if literal is not None:
+            hits = _search_lines(codebase_path, [literal], middleware, fixed_strings=True)
+        else:
+            hits = _search_lines(codebase_path, [pattern], middleware)
 
-            # Parse grep output: file:line:content
-            parts = line.split(":", 2)
-            if len(parts) >= 3:
-                file_path = parts[0]
-                try:
-                    line_number = int(parts[1])
-                except ValueError:
-                    continue
-                line_content = parts[2] if len(parts) > 2 else ""
-
-                # Get context
-                context_before, context_after = get_context(
-                    file_path, line_number, context_lines
-                )
-
-                matches.append(CodeMatch(
-                    file_path=file_path,
-                    line_number=line_number,
-                    line_content=line_content.strip(),
-                    context_before=context_before,
-                    context_after=context_after
-                ))
+        for file_path, line_number, line_content in hits or []:
+            matches.append(_build_match(file_path, line_number, line_content, context_lines))
 
     except subprocess.TimeoutExpired:
         print(f"  Warning: Search timed out for pattern: {pattern}", file=sys.stderr)
@@ -227,29 +436,134 @@ def search_codebase(
     return matches
 
 
+def search_codebase_multi(
+    codebase_path: Path,
+    patterns: list[str],
+    middleware: str = "default",
+    context_lines: int = CONTEXT_LINES
+) -> dict[str, list[CodeMatch]]:
+    """Search codebase for several patterns with a single ripgrep (or grep) run.
+
+    The patterns are passed together (`-e p1 -e p2 ...`) so the tree is
+    scanned once. Each matched line is then attributed to its pattern(s)
+    by re-checking it with Python's `re`. Patterns that `re` cannot
+    compile, or a combined search that fails, fall back to one
+    search_codebase() call per pattern; those run concurrently.
+
+    Returns:
+        dict of pattern -> matches
+    """
+    results: dict[str, list[CodeMatch]] = {}
+    # pattern -> literal string (substring check) or compiled regex
+    matchers: dict[str, str | re.Pattern[str]] = {}
+    # Patterns `re` cannot check, searched on their own
+    separate: list[str] = []
+
+    for pattern in dict.fromkeys(p for p in patterns if p):
+        literal = pattern_literal(pattern)
+        if literal is not None:
+            matchers[pattern] = literal
+            continue
+        try:
+            # POSIX classes like [[:alpha:]] are valid ERE but mean something else in `re`
+            if POSIX_CLASS_RE.search(pattern):
+                raise re.error("POSIX character class")
+            matchers[pattern] = re.compile(pattern)
+        except re.error:
+            separate.append(pattern)
+
+    results.update(_search_each(codebase_path, separate, middleware, context_lines))
+    if not matchers:
+        return results
+
+    # All literals: search them as fixed strings
+    fixed_strings = all(isinstance(m, str) for m in matchers.values())
+    search_patterns = list(matchers.values()) if fixed_strings else list(matchers)
+
+    try:
+        hits = _search_lines(codebase_path, search_patterns, middleware, fixed_strings)
+    except subprocess.TimeoutExpired:
+        print("  Warning: Combined search timed out", file=sys.stderr)
+        hits = None
+    except Exception as e:
+        print(f"  Warning: Combined search error: {e}", file=sys.stderr)
+        hits = None
+
+    if hits is None:
+        # Search each pattern on its own so one bad pattern does not hide the others
+        results.update(_search_each(codebase_path, list(matchers), middleware, context_lines))
+        return results
+
+    for pattern in matchers:
+        results[pattern] = []
+    for file_path, line_number, line_content in hits:
+        match = None
+        for pattern, matcher in matchers.items():
+            if isinstance(matcher, str):
+                found = matcher in line_content
+            else:
+                found = matcher.search(line_content) is not None
+            if found:
+                if match is None:
+                    match = _build_match(file_path, line_number, line_content, context_lines)
+                results[pattern].append(match)
+
+    return results
+
+
+def _search_each(
+    codebase_path: Path,
+    patterns: list[str],
+    middleware: str,
+    context_lines: int
+) -> dict[str, list[CodeMatch]]:
+    """Run search_codebase() for each pattern, several searches at a time."""
+    if not patterns:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(SEARCH_WORKERS, len(patterns))) as executor:
+        found = executor.map(
+            lambda pattern: search_codebase(codebase_path, pattern, middleware, context_lines),
+            patterns
+        )
+        return dict(zip(patterns, found))
+
+
 # =============================================================================
 # AI Analysis Functions
 # =============================================================================
 
-def analyze_with_claude_api(
-    change: dict[str, Any],
-    matches: list[CodeMatch],
-    api_key: str,
-    middleware: str = "default"
-) -> str:
-    """Analyze impact using Claude API."""
-    if not HAS_ANTHROPIC:
-        return "Error: anthropic SDK not installed. Run: uv add anthropic"
+def build_analysis_system_prompt(middleware: str = "default") -> str:
+    """Build the static instructions shared by every analysis request."""
+    mw_name = MIDDLEWARE_NAMES.get(middleware.lower(), MIDDLEWARE_NAMES["default"])
 
-    if not matches:
-        return "該当するコードは見つかりませんでした。"
+    return f"""あなたは{mw_name}コードの専門家です。提示される破壊的変更が、提示されたコードにどのような影響を与えるか分析してください。
 
-    mw_name = MIDDLEWARE_NAMES.get(middleware.lower(), MIDDLEWARE_NAMES["default"])
+## 分析してください
+1. **影響の概要**: この変更がコードにどう影響するか
+2. **リスクレベル**: 高/中/低
+3. **修正方法**: 具体的な修正コード例
+4. **注意点**: 修正時の注意事項
+
+簡潔かつ具体的に回答してください。"""
 
-    # Build context for AI
+
+def build_batch_system_prompt(middleware: str = "default") -> str:
+    """Build the instructions for analyzing several changes in one request."""
+    return build_analysis_system_prompt(middleware) + """
+
+## 出力形式
+複数の変更が「# 変更 <番号>」の見出しで提示されます。すべての変更を分析し、次の形式の JSON のみを出力してください（前後に説明文やコードブロックを付けないこと）:
+{"results": [{"index": <変更番号>, "summary": "影響の概要", "risk": "高|中|低", "fix": "修正方法（コード例を含む）", "notes": "注意点"}]}"""
+
+
+def build_change_prompt(change: dict[str, Any], matches: list[CodeMatch]) -> str:
+    """Build the per-change part of an analysis request: the change and its code."""
     code_context = []
+    langs: dict[str, str] = {}
     for match in matches[:10]:  # Limit to 10 matches
-        lang = get_file_language(match.file_path)
+        lang = langs.get(match.file_path)
+        if lang is None:
+            lang = langs[match.file_path] = get_file_language(match.file_path)
         context = "\n".join([
             f"File: {match.file_path}:{match.line_number}",
             f"```{lang}",
@@ -261,36 +575,227 @@ def analyze_with_claude_api(
         ])
         code_context.append(context)
 
-    prompt = f"""あなたは{mw_name}コードの専門家です。以下の破壊的変更が、提示されたコードにどのような影響を与えるか分析してください。
-
-## 破壊的変更
+    return f"""## 破壊的変更
 - **説明**: {change.get('description', 'N/A')}
 - **日本語説明**: {change.get('description_ja', 'N/A')}
 - **推奨対応**: {change.get('replacement', 'N/A')}
 
 ## 該当コード
-{chr(10).join(code_context)}
+{chr(10).join(code_context)}"""
 
-## 分析してください
-1. **影響の概要**: この変更がコードにどう影響するか
-2. **リスクレベル**: 高/中/低
-3. **修正方法**: 具体的な修正コード例
-4. **注意点**: 修正時の注意事項
 
-簡潔かつ具体的に回答してください。"""
+async def _create_message(
+    client: "anthropic.AsyncAnthropic",
+    system_prompt: str,
+    prompt: str,
+    max_tokens: int,
+    usage: dict[str, int] | None
+) -> str:
+    """Send one request with a cached system prompt and return the response text.
+
+    Token counts are added to `usage`.
+    """
+    response = await client.messages.create(
+        model=AI_MODEL,
+        max_tokens=max_tokens,
+        system=[{
+            "type": "text",
+            "text": system_prompt,
+            "cache_control": {"type": "ephemeral"},
+        }],
+        messages=[{"role": "user", "content": prompt}]
+    )
+
+    if usage is not None:
+        for key in ("input_tokens", "cache_read_input_tokens", "cache_creation_input_tokens"):
+            usage[key] = usage.get(key, 0) + (getattr(response.usage, key, 0) or 0)
+
+    return response.content[0].text
+
+
+async def analyze_with_claude_api(
+    change: dict[str, Any],
+    matches: list[CodeMatch],
+    client: "anthropic.AsyncAnthropic",
+    system_prompt: str,
+    usage: dict[str, int] | None = None
+) -> str:
+    """Analyze impact using Claude API.
+
+    The static instructions are sent as a cached system prompt; only the
+    change and its code vary per request. Token counts are added to `usage`.
+    """
+    if not matches:
+        return "該当するコードは見つかりませんでした。"
+
+    prompt = build_change_prompt(change, matches)
 
     try:
-        client = anthropic.Anthropic(api_key=api_key)
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        return response.content[0].text
+        return await _create_message(client, system_prompt, prompt, AI_MAX_TOKENS, usage)
     except Exception as e:
         return f"API Error: {e}"
 
 
+def pack_batches(prompts: list[str], batch_tokens: int = AI_BATCH_TOKENS) -> list[list[int]]:
+    """Greedily group prompt indexes into batches under an input token budget.
+
+    Tokens are estimated as len(prompt) // 4. A prompt larger than the
+    budget gets a batch of its own.
+    """
+    batches: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = 0
+
+    for i, prompt in enumerate(prompts):
+        tokens = len(prompt) // 4
+        if current and (
+            current_tokens + tokens > batch_tokens or len(current) >= AI_BATCH_MAX_ITEMS
+        ):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def format_batch_result(item: dict[str, Any]) -> str:
+    """Render one entry of a batched JSON response as Markdown."""
+    return "\n\n".join([
+        f"**影響の概要**: {item.get('summary', 'N/A')}",
+        f"**リスクレベル**: {item.get('risk', 'N/A')}",
+        f"**修正方法**:\n\n{item.get('fix', 'N/A')}",
+        f"**注意点**: {item.get('notes', 'N/A')}",
+    ])
+
+
+def parse_batch_response(text: str, count: int) -> list[str]:
+    """Split a batched JSON response into one analysis per change.
+
+    Changes missing from the response get an "API Error" entry, which is
+    not cached, so they are retried on the next run.
+    """
+    missing = "API Error: No result for this change in the batched response"
+
+    # Tolerate a code fence or stray text around the JSON object
+    start, end = text.find("{"), text.rfind("}")
+    try:
+        data = json.loads(text[start:end + 1])
+        items = data["results"]
+    except (ValueError, KeyError, TypeError) as e:
+        return [f"API Error: Could not parse batched response: {e}"] * count
+
+    analyses = [missing] * count
+    for item in items:
+        index = item.get("index") if isinstance(item, dict) else None
+        if isinstance(index, int) and 0 <= index < count:
+            analyses[index] = format_batch_result(item)
+    return analyses
+
+
+async def analyze_batch_with_claude_api(
+    prompts: list[str],
+    client: "anthropic.AsyncAnthropic",
+    system_prompt: str,
+    usage: dict[str, int] | None = None
+) -> list[str]:
+    """Analyze several changes in one request with a JSON response.
+
+    Returns:
+        list of analyses, in the same order as prompts
+    """
+    prompt = "\n\n".join(f"# 変更 {i}\n\n{p}" for i, p in enumerate(prompts))
+    max_tokens = min(AI_MAX_TOKENS * len(prompts), AI_BATCH_MAX_OUTPUT_TOKENS)
+
+    try:
+        text = await _create_message(client, system_prompt, prompt, max_tokens, usage)
+    except Exception as e:
+        return [f"API Error: {e}"] * len(prompts)
+
+    return parse_batch_response(text, len(prompts))
+
+
+async def analyze_all_with_claude_api(
+    items: list[tuple[dict[str, Any], list[CodeMatch]]],
+    api_key: str,
+    middleware: str = "default",
+    batch: bool = False
+) -> list[str]:
+    """Analyze several changes concurrently using Claude API.
+
+    Up to AI_CONCURRENCY requests are in flight at once, sharing one client.
+    Changes whose prompts are identical are sent once and share the answer.
+    With batch, changes are packed into as few requests as the token budget
+    allows (see pack_batches) and answered as JSON.
+
+    Returns:
+        list of analyses, in the same order as items
+    """
+    if not HAS_ANTHROPIC:
+        return ["Error: anthropic SDK not installed. Run: uv add anthropic"] * len(items)
+
+    semaphore = asyncio.Semaphore(AI_CONCURRENCY)
+    usage: dict[str, int] = {}
+
+    # Coalesce identical prompts: prompt -> index of its first item
+    prompts = [build_change_prompt(change, matches) for change, matches in items]
+    first_index: dict[str, int] = {}
+    for i, prompt in enumerate(prompts):
+        first_index.setdefault(prompt, i)
+    unique = list(first_index.values())
+    if len(unique) < len(items):
+        print(f"  {len(items) - len(unique)} duplicate prompts coalesced", file=sys.stderr)
+
+    # One client for the whole run, so requests reuse warm keep-alive
+    # connections (multiplexed over HTTP/2 when h2 is installed). The SDK's
+    # own httpx client class keeps its default limits and timeouts.
+    http_client = anthropic.DefaultAsyncHttpxClient(http2=HAS_H2)
+
+    async with anthropic.AsyncAnthropic(api_key=api_key, http_client=http_client) as client:
+        if batch:
+            system_prompt = build_batch_system_prompt(middleware)
+            batches = [
+                [unique[j] for j in batch]
+                for batch in pack_batches([prompts[i] for i in unique])
+            ]
+            print(f"  {len(unique)} changes in {len(batches)} requests", file=sys.stderr)
+
+            async def analyze_batch(indexes: list[int]) -> list[str]:
+                async with semaphore:
+                    return await analyze_batch_with_claude_api(
+                        [prompts[i] for i in indexes], client, system_prompt, usage
+                    )
+
+            batch_results = await asyncio.gather(*(analyze_batch(b) for b in batches))
+
+            by_index: dict[int, str] = {}
+            for indexes, results in zip(batches, batch_results):
+                by_index.update(zip(indexes, results))
+        else:
+            system_prompt = build_analysis_system_prompt(middleware)
+
+            async def analyze(change: dict[str, Any], matches: list[CodeMatch]) -> str:
+                async with semaphore:
+                    return await analyze_with_claude_api(change, matches, client, system_prompt, usage)
+
+            results = await asyncio.gather(*(analyze(*items[i]) for i in unique))
+            by_index = dict(zip(unique, results))
+
+    analyses = [by_index[first_index[prompt]] for prompt in prompts]
+
+    if usage:
+        print(
+            f"  Input tokens: {usage['input_tokens']}"
+            f" (cache read: {usage['cache_read_input_tokens']},"
+            f" cache write: {usage['cache_creation_input_tokens']})",
+            file=sys.stderr
+        )
+
+    return analyses
+
+
 def generate_claude_code_prompt(
     change: dict[str, Any],
     matches: list[CodeMatch]
@@ -327,18 +832,88 @@ def generate_claude_code_prompt(
     return "\n".join(prompt_lines)
 
 
+# =============================================================================
+# Analysis Cache
+# =============================================================================
+
+# Cached API analyses, under the output directory
+ANALYSIS_CACHE_DIR = ".cache"
+# Cached analyses older than this are ignored and re-requested
+ANALYSIS_CACHE_TTL_DAYS = 30
+
+
+def analysis_cache_key(
+    change: dict[str, Any],
+    matches: list[CodeMatch],
+    middleware: str = "default",
+    batch: bool = False
+) -> str:
+    """Key an analysis by exactly what is sent to the API.
+
+    The model, the system prompt and the per-change prompt (description,
+    replacement, matched code with its context) are hashed together, so
+    any change to the request misses the cache.
+    """
+    if batch:
+        system_prompt = build_batch_system_prompt(middleware)
+    else:
+        system_prompt = build_analysis_system_prompt(middleware)
+    payload = json.dumps(
+        [AI_MODEL, system_prompt, build_change_prompt(change, matches)],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_cached_analysis(cache_dir: Path, key: str) -> str | None:
+    """Return a cached analysis, or None if there is none or it has expired."""
+    cache_file = cache_dir / f"{key}.md"
+    try:
+        age = time.time() - cache_file.stat().st_mtime
+        if age > ANALYSIS_CACHE_TTL_DAYS * 86400:
+            return None
+        return cache_file.read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def save_cached_analysis(cache_dir: Path, key: str, analysis: str) -> None:
+    """Store an analysis in the cache (failed API calls are not cached)."""
+    if analysis.startswith(("API Error:", "Error:")):
+        return
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_file = cache_dir / f"{key}.md"
+        tmp_file = cache_file.with_suffix(".tmp")
+        tmp_file.write_text(analysis, encoding="utf-8")
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"  Warning: Could not write analysis cache: {e}", file=sys.stderr)
+
+
 # =============================================================================
 # Input Loading
 # =============================================================================
 
+# Maximum threads for reading input files
+LOAD_WORKERS = 16
+
+
+def load_json(path: Path) -> Any:
+    """Read and parse a JSON file in one read, using orjson when installed."""
+    raw = path.read_bytes()
+    if HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 def load_changes_from_file(changes_path: Path) -> tuple[list[dict[str, Any]], str | None]:
     """Load changes from a single JSON file.
 
     Returns:
         tuple: (list of changes, middleware name or None)
     """
-    with open(changes_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(changes_path)
 
     middleware = data.get("middleware", None)
 
@@ -372,12 +947,15 @@ def load_changes_from_input_dir(input_dir: Path) -> tuple[list[dict[str, Any]],
     if not json_files:
         return [], None
 
-    for json_file in json_files:
-        print(f"  Loading: {json_file.name}", file=sys.stderr)
-        changes, mw = load_changes_from_file(json_file)
-        all_changes.extend(changes)
-        if mw and not middleware:
-            middleware = mw
+    # Read and parse files in parallel; results come back in file order
+    with ThreadPoolExecutor(max_workers=min(LOAD_WORKERS, len(json_files))) as executor:
+        for json_file, (changes, mw) in zip(
+            json_files, executor.map(load_changes_from_file, json_files)
+        ):
+            print(f"  Loading: {json_file.name}", file=sys.stderr)
+            all_changes.extend(changes)
+            if mw and not middleware:
+                middleware = mw
 
     return all_changes, middleware
 
@@ -386,25 +964,49 @@ def load_changes_from_input_dir(input_dir: Path) -> tuple[list[dict[str, Any]],
 # Output Generation
 # =============================================================================
 
+def write_json(path: Path, data: Any) -> None:
+    """Write data as indented UTF-8 JSON in a single write, using orjson when installed."""
+    if HAS_ORJSON:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def summarize_results(results: list[ImpactResult]) -> dict[str, int]:
+    """Compute the summary counts in a single pass over the results."""
+    changes_with_matches = 0
+    total_matches = 0
+    affected_files: set[str] = set()
+    for r in results:
+        if r.matches:
+            changes_with_matches += 1
+            total_matches += len(r.matches)
+            affected_files.update(r.files_matches)
+
+    return {
+        "total_changes": len(results),
+        "changes_with_matches": changes_with_matches,
+        "total_affected_files": len(affected_files),
+        "total_matches": total_matches,
+    }
+
+
 def generate_json_output(
     results: list[ImpactResult],
     codebase_path: str,
     middleware: str,
-    timestamp: str
+    timestamp: str,
+    summary: dict[str, int] | None = None
 ) -> dict[str, Any]:
-    """Generate structured JSON output."""
+    """Generate structured JSON output.
+
+    `summary` is the result of summarize_results(), computed here if omitted.
+    """
     output = {
         "analyze_timestamp": timestamp,
         "codebase": codebase_path,
         "middleware": middleware,
-        "summary": {
-            "total_changes": len(results),
-            "changes_with_matches": sum(1 for r in results if r.matches),
-            "total_affected_files": len(set(
-                f for r in results for f in r.affected_files
-            )),
-            "total_matches": sum(len(r.matches) for r in results),
-        },
+        "summary": summary if summary is not None else summarize_results(results),
         "results": []
     }
 
@@ -435,104 +1037,88 @@ def generate_markdown_report(
     results: list[ImpactResult],
     codebase_path: str,
     middleware: str,
-    timestamp: str
-) -> str:
-    """Generate a Markdown impact report."""
-    lines = [
-        "# コードベース影響分析レポート",
-        "",
-        f"**生成日時**: {timestamp}",
-        f"**対象コードベース**: `{codebase_path}`",
-        f"**ミドルウェア**: {middleware}",
-        f"**分析した変更数**: {len(results)}",
-        "",
-        "---",
-        "",
-        "## サマリー",
-        "",
-        "| # | 変更タイプ | 変更内容 | 該当ファイル数 | リスク |",
-        "|---|-----------|----------|---------------|--------|",
-    ]
+    timestamp: str,
+    out: TextIO
+) -> None:
+    """Write a Markdown impact report to `out`, streaming it section by section."""
+    out.write(
+        "# コードベース影響分析レポート\n"
+        "\n"
+        f"**生成日時**: {timestamp}\n"
+        f"**対象コードベース**: `{codebase_path}`\n"
+        f"**ミドルウェア**: {middleware}\n"
+        f"**分析した変更数**: {len(results)}\n"
+        "\n"
+        "---\n"
+        "\n"
+        "## サマリー\n"
+        "\n"
+        "| # | 変更タイプ | 変更内容 | 該当ファイル数 | リスク |\n"
+        "|---|-----------|----------|---------------|--------|\n"
+    )
 
     for i, result in enumerate(results, 1):
         change_type = result.change.get('type', 'unknown')
         desc = result.change.get('description', 'N/A')[:50]
-        file_count = len(set(m.file_path for m in result.matches))
+        file_count = len(result.files_matches)
         risk = "⚠️ 要対応" if file_count > 0 else "✅ 影響なし"
-        lines.append(f"| {i} | {change_type} | {desc}... | {file_count} | {risk} |")
+        out.write(f"| {i} | {change_type} | {desc}... | {file_count} | {risk} |\n")
 
-    lines.extend(["", "---", ""])
+    out.write("\n---\n")
 
     # Count changes with matches
     affected_results = [r for r in results if r.matches]
     if not affected_results:
-        lines.extend([
-            "## 結果",
-            "",
-            "**該当箇所なし** - コードベースにアップグレードによる影響はありませんでした。",
-            "",
-        ])
-        return "\n".join(lines)
+        out.write(
+            "\n"
+            "## 結果\n"
+            "\n"
+            "**該当箇所なし** - コードベースにアップグレードによる影響はありませんでした。\n"
+        )
+        return
 
     # Detailed results (only for changes with matches)
     for i, result in enumerate(affected_results, 1):
         change = result.change
-        lines.extend([
-            f"## {i}. {change.get('description', 'N/A')[:80]}",
-            "",
-            f"- **バージョン**: {change.get('version', 'N/A')}",
-            f"- **タイプ**: {change.get('type', 'N/A')}",
-            f"- **カテゴリ**: {change.get('category', 'N/A')}",
-        ])
+        out.write(
+            "\n"
+            f"## {i}. {change.get('description', 'N/A')[:80]}\n"
+            "\n"
+            f"- **バージョン**: {change.get('version', 'N/A')}\n"
+            f"- **タイプ**: {change.get('type', 'N/A')}\n"
+            f"- **カテゴリ**: {change.get('category', 'N/A')}\n"
+        )
 
         if change.get('description_ja'):
-            lines.append(f"- **日本語説明**: {change.get('description_ja')}")
+            out.write(f"- **日本語説明**: {change.get('description_ja')}\n")
         if change.get('replacement'):
-            lines.append(f"- **推奨対応**: {change.get('replacement')}")
+            out.write(f"- **推奨対応**: {change.get('replacement')}\n")
         if change.get('pattern'):
-            lines.append(f"- **検索パターン**: `{change.get('pattern')}`")
+            out.write(f"- **検索パターン**: `{change.get('pattern')}`\n")
 
-        lines.append("")
+        out.write("\n")
 
         if result.matches:
-            lines.append("### 該当箇所")
-            lines.append("")
+            out.write("### 該当箇所\n\n")
 
-            # Group by file
-            files_matches: dict[str, list[CodeMatch]] = {}
-            for match in result.matches:
-                if match.file_path not in files_matches:
-                    files_matches[match.file_path] = []
-                files_matches[match.file_path].append(match)
-
-            for file_path, file_matches in files_matches.items():
-                lines.append(f"#### `{file_path}`")
-                lines.append("")
+            for file_path, file_matches in result.files_matches.items():
+                out.write(f"#### `{file_path}`\n\n")
 
                 lang = get_file_language(file_path)
 
                 for match in file_matches[:5]:  # Limit per file
-                    lines.append(f"**Line {match.line_number}**:")
-                    lines.append(f"```{lang}")
+                    out.write(f"**Line {match.line_number}**:\n```{lang}\n")
                     for ctx in match.context_before[-2:]:
-                        lines.append(ctx)
-                    lines.append(f">>> {match.line_content}  // <-- 該当行")
+                        out.write(f"{ctx}\n")
+                    out.write(f">>> {match.line_content}  // <-- 該当行\n")
                     for ctx in match.context_after[:2]:
-                        lines.append(ctx)
-                    lines.append("```")
-                    lines.append("")
+                        out.write(f"{ctx}\n")
+                    out.write("```\n\n")
 
         if result.ai_analysis:
-            lines.extend([
-                "### AI 分析",
-                "",
-                result.ai_analysis,
-                "",
-            ])
-
-        lines.extend(["---", ""])
+            out.write(f"### AI 分析\n\n{result.ai_analysis}\n\n")
 
-    return "\n".join(lines)
+        out.write("---\n")
 
 
 # =============================================================================
@@ -569,6 +1155,16 @@ def main():
         "--api-key",
         help="Anthropic API key (or set ANTHROPIC_API_KEY env var)"
     )
+    parser.add_argument(
+        "--ai-batch",
+        action="store_true",
+        help="With --ai api, analyze several changes per API request (JSON response)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached API analyses and request them again (results are still cached)"
+    )
     parser.add_argument(
         "--output-dir", "-o",
         type=Path,
@@ -644,6 +1240,13 @@ def main():
     print(f"\nAnalyzing codebase...", file=sys.stderr)
     results: list[ImpactResult] = []
 
+    # Search all patterns in one pass over the codebase
+    matches_by_pattern = search_codebase_multi(
+        codebase_path,
+        [c.get("pattern") for c in analyzable_changes],
+        middleware
+    )
+
     for i, change in enumerate(analyzable_changes, 1):
         pattern = change.get("pattern")
         desc = change.get("description", "Unknown")[:50]
@@ -652,25 +1255,58 @@ def main():
         print(f"[{i}/{len(analyzable_changes)}] [{change_type}] {desc}...", file=sys.stderr)
 
         # Search codebase
-        matches = search_codebase(codebase_path, pattern, middleware) if pattern else []
+        matches = matches_by_pattern.get(pattern, []) if pattern else []
         print(f"  Found {len(matches)} matches", file=sys.stderr)
 
-        # AI analysis
+        # Claude Code prompt (API analysis runs concurrently after the loop)
         ai_analysis = ""
-        if matches:
-            if args.ai == "api":
-                print(f"  Analyzing with Claude API...", file=sys.stderr)
-                ai_analysis = analyze_with_claude_api(change, matches, api_key, middleware)
-            elif args.ai == "claude-code":
-                ai_analysis = generate_claude_code_prompt(change, matches)
+        if matches and args.ai == "claude-code":
+            ai_analysis = generate_claude_code_prompt(change, matches)
+
+        # Group by file once; reports and the summary reuse the grouping
+        files_matches: defaultdict[str, list[CodeMatch]] = defaultdict(list)
+        for match in matches:
+            files_matches[match.file_path].append(match)
 
         results.append(ImpactResult(
             change=change,
             matches=matches,
             ai_analysis=ai_analysis,
-            affected_files=list(set(m.file_path for m in matches))
+            affected_files=list(files_matches),
+            files_matches=files_matches
         ))
 
+    # Release cached file mappings once every pattern has been searched
+    _line_index.cache_clear()
+
+    # AI analysis
+    if args.ai == "api":
+        cache_dir = output_dir / ANALYSIS_CACHE_DIR
+        pending = []
+        for result in results:
+            if not result.matches:
+                continue
+            key = analysis_cache_key(result.change, result.matches, middleware, args.ai_batch)
+            cached = None if args.no_cache else load_cached_analysis(cache_dir, key)
+            if cached is not None:
+                result.ai_analysis = cached
+            else:
+                pending.append((key, result))
+
+        if not args.no_cache:
+            hits = sum(1 for r in results if r.ai_analysis)
+            print(f"\nAnalysis cache: {hits} hits, {len(pending)} misses ({cache_dir})", file=sys.stderr)
+
+        if pending:
+            print(f"\nAnalyzing {len(pending)} changes with Claude API...", file=sys.stderr)
+            analyses = asyncio.run(analyze_all_with_claude_api(
+                [(r.change, r.matches) for _, r in pending], api_key, middleware,
+                batch=args.ai_batch
+            ))
+            for (key, result), ai_analysis in zip(pending, analyses):
+                result.ai_analysis = ai_analysis
+                save_cached_analysis(cache_dir, key, ai_analysis)
+
     # Create output directory
     output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -678,22 +1314,22 @@ def main():
     timestamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
     timestamp_iso = datetime.now(timezone.utc).isoformat()
 
+    summary = summarize_results(results)
+
     # Write JSON output
-    json_output = generate_json_output(results, str(codebase_path), middleware, timestamp_iso)
+    json_output = generate_json_output(results, str(codebase_path), middleware, timestamp_iso, summary)
     json_file = output_dir / f"impact-{middleware}-{timestamp}.json"
-    with open(json_file, "w", encoding="utf-8") as f:
-        json.dump(json_output, f, indent=2, ensure_ascii=False)
+    write_json(json_file, json_output)
 
     # Write Markdown output
-    md_content = generate_markdown_report(results, str(codebase_path), middleware, timestamp_iso)
     md_file = output_dir / "impact_report.md"
     with open(md_file, "w", encoding="utf-8") as f:
-        f.write(md_content)
+        generate_markdown_report(results, str(codebase_path), middleware, timestamp_iso, f)
 
     # Summary
-    affected_count = sum(1 for r in results if r.matches)
-    total_matches = sum(len(r.matches) for r in results)
-    affected_files = len(set(f for r in results for f in r.affected_files))
+    affected_count = summary["changes_with_matches"]
+    total_matches = summary["total_matches"]
+    affected_files = summary["total_affected_files"]
 
     print("\n" + "=" * 60, file=sys.stderr)
     print("完了", file=sys.stderr)
@@ -16,13 +16,21 @@ Usage:
 """
 
 import argparse
+import base64
 import json
+import mmap
 import os
 import re
+import shutil
 import subprocess
 import sys
+import threading
+import time
+from array import array
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -94,6 +102,41 @@ EXT_TO_LANGUAGE: dict[str, str] = {
     "css": "css",
 }
 
+# ripgrep binary, if installed (falls back to grep)
+RIPGREP = shutil.which("rg")
+
+SEARCH_TIMEOUT = 60
+
+# Matches kept (with context) per pattern; the rest are only counted
+MAX_MATCHES = 50
+
+# Matches shown per file in the Markdown report
+REPORT_MATCHES_PER_FILE = 5
+
+# Claude API requests in flight at once (--ai api)
+AI_WORKERS = 8
+# Retries the SDK makes on rate limits, 5xx and connection errors (with backoff)
+AI_MAX_RETRIES = 3
+
+# POSIX bracket classes ([:alpha:] etc.), which Python's re does not support
+POSIX_CLASS_RE = re.compile(r"\[:[a-z]+:\]")
+
+# Python 3.11+ has tomllib built-in, fallback for older versions
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# Optional: ijson (streaming JSON parser for large change files)
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
 # Optional: anthropic SDK
 try:
     import anthropic
@@ -101,6 +144,10 @@ try:
 except ImportError:
     HAS_ANTHROPIC = False
 
+# Shared Claude API client, created on first use (see _get_client)
+_CLIENT: "anthropic.Anthropic | None" = None
+_CLIENT_LOCK = threading.Lock()
+
 
 @dataclass
 class CodeMatch:
@@ -134,65 +181,249 @@ def get_file_language(file_path: str) -> str:
     return EXT_TO_LANGUAGE.get(ext, "")
 
 
-def search_codebase(
+def _rg_text(value: dict[str, str]) -> str:
+    """Decode a ripgrep JSON text value ({"text": ...} or {"bytes": base64})."""
+    if "text" in value:
+        return value["text"]
+    return base64.b64decode(value["bytes"]).decode("utf-8", errors="ignore")
+
+
+def _search_with_ripgrep(
     codebase_path: Path,
-    pattern: str,
-    middleware: str = "default",
-    context_lines: int = 5
-) -> list[CodeMatch]:
-    """Search codebase for pattern matches using grep."""
+    patterns: list[str],
+    extensions: list[str],
+    context_lines: int
+) -> tuple[list[CodeMatch], dict[str, dict[int, str]]] | None:
+    """Search with `rg --json` for lines matching any of the patterns.
+
+    Context lines are taken from ripgrep's own output: events are read as
+    ripgrep streams them and match/context lines are collected per file,
+    so the files do not have to be read again for context.
+
+    Returns:
+        tuple: (matches without context or stripping, file -> {line number: line}),
+        or None if ripgrep rejected a pattern and the caller should fall
+        back to grep
+    """
+    # --engine auto: switch to PCRE2 (JIT-compiled) for patterns that need
+    # look-around or backreferences, keep the default engine otherwise
+    rg_cmd = [
+        RIPGREP, "--json", "--engine", "auto",
+        "--before-context", str(context_lines),
+        "--after-context", str(context_lines),
+    ]
+    for pattern in patterns:
+        rg_cmd.extend(["-e", pattern])
+    for ext in extensions:
+        rg_cmd.extend(["-g", f"*.{ext}"])
+    rg_cmd.append(str(codebase_path))
+
+    # file -> {line number: line}, and file -> matched line numbers
+    file_lines: dict[str, dict[int, str]] = {}
+    file_hits: dict[str, list[tuple[int, str]]] = {}
+
+    proc = subprocess.Popen(
+        rg_cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        encoding="utf-8",
+    )
+    timer = threading.Timer(SEARCH_TIMEOUT, proc.kill)
+    timer.start()
+    try:
+        for line in proc.stdout:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                # Output cut off mid-line by the timeout kill
+                if timer.finished.is_set():
+                    break
+                raise
+            kind = event.get("type")
+            if kind != "match" and kind != "context":
+                continue
+            data = event["data"]
+            path = _rg_text(data["path"])
+            line_number = data["line_number"]
+            text = _rg_text(data["lines"])
+            file_lines.setdefault(path, {})[line_number] = text.rstrip()
+            if kind == "match":
+                file_hits.setdefault(path, []).append((line_number, text.rstrip("\r\n")))
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+        returncode = proc.wait()
+
+    if returncode < 0:
+        raise subprocess.TimeoutExpired(rg_cmd, SEARCH_TIMEOUT)
+
+    # Exit code 2 without any hits means the search itself failed
+    # (typically a pattern neither regex engine supports)
+    if returncode == 2 and not file_hits:
+        return None
+
+    matches = [
+        CodeMatch(
+            file_path=path,
+            line_number=line_number,
+            line_content=line_content
+        )
+        for path, hits in file_hits.items()
+        for line_number, line_content in hits
+    ]
+
+    return matches, file_lines
+
+
+def _search_with_grep(
+    codebase_path: Path,
+    patterns: list[str],
+    extensions: list[str],
+    context_lines: int
+) -> tuple[list[CodeMatch], None] | None:
+    """Search with `grep -rn -E` for lines matching any of the patterns.
+
+    grep does not return context lines; they are read later from each
+    file with get_context().
+
+    Returns:
+        tuple: (matches without context or stripping, None), or None if grep rejected
+        a pattern
+    """
     matches = []
 
-    if not pattern:
-        return matches
+    # Build grep command with middleware-specific extensions
+    # (-Z ends each file name with a NUL byte, so names containing ":" parse correctly)
+    grep_cmd = ["grep", "-rnZ", "-E"]
+    for ext in extensions:
+        grep_cmd.append(f"--include=*.{ext}")
+    for pattern in patterns:
+        grep_cmd.extend(["-e", pattern])
+    grep_cmd.append(str(codebase_path))
+
+    proc = subprocess.Popen(grep_cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    timer = threading.Timer(SEARCH_TIMEOUT, proc.kill)
+    timer.start()
+    try:
+        for raw in proc.stdout:
+            # Parse grep output as bytes: file\0line:content
+            sep = raw.find(b"\0")
+            colon = raw.find(b":", sep + 1)
+            if sep < 0 or colon < 0:
+                continue
+            try:
+                line_number = int(raw[sep + 1:colon])
+            except ValueError:
+                continue
+
+            matches.append(CodeMatch(
+                file_path=os.fsdecode(raw[:sep]),
+                line_number=line_number,
+                line_content=raw[colon + 1:].decode("utf-8", errors="ignore").rstrip("\r\n")
+            ))
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+        returncode = proc.wait()
+
+    if returncode < 0:
+        raise subprocess.TimeoutExpired(grep_cmd, SEARCH_TIMEOUT)
+
+    if returncode == 2 and not matches:
+        return None
+
+    return matches, None
+
 
+def _search_lines(
+    codebase_path: Path,
+    patterns: list[str],
+    middleware: str,
+    context_lines: int
+) -> tuple[list[CodeMatch], dict[str, dict[int, str]] | None] | None:
+    """Run one ripgrep (or grep) search for lines matching any of the patterns.
+
+    Returns:
+        tuple: (matches sorted by file and line (ripgrep searches files in
+        parallel), lines ripgrep returned per file or None), or None if
+        neither tool accepted the patterns
+    """
     # Get file extensions for this middleware
     extensions = MIDDLEWARE_FILE_EXTENSIONS.get(
         middleware.lower(),
         MIDDLEWARE_FILE_EXTENSIONS["default"]
     )
 
-    # Build grep command with middleware-specific extensions
-    grep_cmd = ["grep", "-rn", "-E"]
-    for ext in extensions:
-        grep_cmd.append(f"--include=*.{ext}")
-    grep_cmd.extend([pattern, str(codebase_path)])
+    found = None
+    if RIPGREP:
+        found = _search_with_ripgrep(codebase_path, patterns, extensions, context_lines)
+    if found is None:
+        found = _search_with_grep(codebase_path, patterns, extensions, context_lines)
+    if found is None:
+        return None
 
-    try:
-        # Use grep to find matches
-        result = subprocess.run(
-            grep_cmd,
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
+    # Same order whichever tool ran
+    found[0].sort(key=lambda m: (m.file_path, m.line_number))
+    return found
 
-        for line in result.stdout.strip().split("\n"):
-            if not line:
-                continue
 
-            # Parse grep output: file:line:content
-            parts = line.split(":", 2)
-            if len(parts) >= 3:
-                file_path = parts[0]
-                try:
-                    line_number = int(parts[1])
-                except ValueError:
-                    continue
-                line_content = parts[2] if len(parts) > 2 else ""
-
-                # Get context
-                context_before, context_after = get_context(
-                    file_path, line_number, context_lines
-                )
+def _strip_lines(matches: list[CodeMatch]) -> None:
+    """Strip surrounding whitespace from matched lines for display."""
+    for match in matches:
+        match.line_content = match.line_content.strip()
+
+
+def _attach_context(
+    matches: list[CodeMatch],
+    file_lines: dict[str, dict[int, str]] | None,
+    context_lines: int
+) -> None:
+    """Fill in context lines, from ripgrep's output if given, else from the files."""
+    for match in matches:
+        if match.context_before or match.context_after:
+            # Already filled (a line matched by several patterns)
+            continue
+        line_number = match.line_number
+        if file_lines is None:
+            match.context_before, match.context_after = get_context(
+                match.file_path, line_number, context_lines
+            )
+            continue
+        lines = file_lines[match.file_path]
+        match.context_before = [
+            lines[n] for n in range(line_number - context_lines, line_number)
+            if n in lines
+        ]
+        match.context_after = [
+            lines[n] for n in range(line_number + 1, line_number + context_lines + 1)
+            if n in lines
+        ]
+
+
+def search_codebase(
+    codebase_path: Path,
+    pattern: str,
+    middleware: str = "default",
+    context_lines: int = 5,
+    max_matches: int = MAX_MATCHES
+) -> list[CodeMatch]:
+    """Search codebase for pattern matches using ripgrep (or grep if unavailable).
 
-                matches.append(CodeMatch(
-                    file_path=file_path,
-                    line_number=line_number,
-                    line_content=line_content.strip(),
-                    context_before=context_before,
-                    context_after=context_after
-                ))
+    Every hit is returned so callers can count hits and files, but context
+    is only read for the first max_matches.
+    """
+    matches = []
+
+    if not pattern:
+        return matches
+
+    try:
+        found = _search_lines(codebase_path, [pattern], middleware, context_lines)
+        if found is not None:
+            matches, file_lines = found
+            _strip_lines(matches)
+            _attach_context(matches[:max_matches], file_lines, context_lines)
 
     except subprocess.TimeoutExpired:
         print(f"  Warning: Search timed out for pattern: {pattern}", file=sys.stderr)
@@ -202,23 +433,134 @@ def search_codebase(
     return matches
 
 
+def search_codebase_multi(
+    codebase_path: Path,
+    patterns: list[str],
+    middleware: str = "default",
+    context_lines: int = 5,
+    max_matches: int = MAX_MATCHES
+) -> dict[str, list[CodeMatch]]:
+    """Search codebase for several patterns with a single ripgrep (or grep) run.
+
+    The tree is walked once with `-e p1 -e p2 ...`; each matched line is
+    then attributed to its pattern(s) by re-checking it with Python's `re`.
+    Patterns `re` cannot check, or a combined search that fails, fall back
+    to one search_codebase() call per pattern.
+
+    As in search_codebase(), every hit is returned but context is only
+    read for the first max_matches of each pattern.
+
+    Returns:
+        dict of pattern -> matches
+    """
+    results: dict[str, list[CodeMatch]] = {}
+    compiled: dict[str, re.Pattern[str]] = {}
+
+    for pattern in dict.fromkeys(p for p in patterns if p):
+        try:
+            # POSIX classes like [[:alpha:]] are valid ERE but mean something else in `re`
+            if POSIX_CLASS_RE.search(pattern):
+                raise re.error("POSIX character class")
+            compiled[pattern] = re.compile(pattern)
+        except re.error:
+            results[pattern] = search_codebase(
+                codebase_path, pattern, middleware, context_lines, max_matches
+            )
+
+    if not compiled:
+        return results
+
+    try:
+        found = _search_lines(codebase_path, list(compiled), middleware, context_lines)
+    except subprocess.TimeoutExpired:
+        print("  Warning: Combined search timed out", file=sys.stderr)
+        found = None
+    except Exception as e:
+        print(f"  Warning: Combined search error: {e}", file=sys.stderr)
+        found = None
+
+    if found is None:
+        # Search each pattern on its own so one bad pattern does not hide the others
+        for pattern in compiled:
+            results[pattern] = search_codebase(
+                codebase_path, pattern, middleware, context_lines, max_matches
+            )
+        return results
+
+    found, file_lines = found
+    for pattern in compiled:
+        results[pattern] = []
+    for match in found:
+        for pattern, regex in compiled.items():
+            if regex.search(match.line_content):
+                results[pattern].append(match)
+
+    # Attributed against the raw lines; stripped only for display
+    _strip_lines(found)
+    for pattern in compiled:
+        _attach_context(results[pattern][:max_matches], file_lines, context_lines)
+
+    return results
+
+
+# Each entry keeps a file mapped (and its descriptor open), so keep this modest
+@lru_cache(maxsize=128)
+def _line_index(file_path: str, mtime_ns: int, size: int) -> tuple[bytes | mmap.mmap, array]:
+    """Map a file into memory and index where each line starts.
+
+    Keyed by mtime and size so a file edited during the run is re-read.
+
+    Returns:
+        tuple: (file contents, byte offsets of line starts followed by the end offset)
+    """
+    with open(file_path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            data = b""
+
+    bounds = array("q", [0])
+    find = data.find
+    pos = find(b"\n")
+    while pos >= 0:
+        bounds.append(pos + 1)
+        pos = find(b"\n", pos + 1)
+    if bounds[-1] != len(data):
+        bounds.append(len(data))
+
+    return data, bounds
+
+
 def get_context(file_path: str, line_number: int, context_lines: int) -> tuple[list[str], list[str]]:
-    """Get lines before and after the match."""
+    """Get lines before and after the match, decoding only those lines."""
     try:
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            lines = f.readlines()
+        st = os.stat(file_path)
+        data, bounds = _line_index(file_path, st.st_mtime_ns, st.st_size)
+
+        def line_at(index: int) -> str:
+            return data[bounds[index]:bounds[index + 1]].decode("utf-8", errors="ignore").rstrip()
 
         start = max(0, line_number - context_lines - 1)
-        end = min(len(lines), line_number + context_lines)
+        end = min(len(bounds) - 1, line_number + context_lines)
 
-        before = [l.rstrip() for l in lines[start:line_number - 1]]
-        after = [l.rstrip() for l in lines[line_number:end]]
+        before = [line_at(i) for i in range(start, line_number - 1)]
+        after = [line_at(i) for i in range(line_number, end)]
 
         return before, after
     except Exception:
         return [], []
 
 
+def _get_client(api_key: str) -> "anthropic.Anthropic":
+    """Return the shared API client, so every request reuses its connection pool."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = anthropic.Anthropic(api_key=api_key, max_retries=AI_MAX_RETRIES)
+        return _CLIENT
+
+
 def analyze_with_claude_api(
     change: dict[str, Any],
     matches: list[CodeMatch],
@@ -269,7 +611,7 @@ def analyze_with_claude_api(
 簡潔かつ具体的に回答してください。"""
 
     try:
-        client = anthropic.Anthropic(api_key=api_key)
+        client = _get_client(api_key)
         response = client.messages.create(
             model="claude-sonnet-4-20250514",
             max_tokens=2000,
@@ -288,9 +630,6 @@ def generate_claude_code_prompt(
     if not matches:
         return "該当するコードは見つかりませんでした。"
 
-    # Build file list
-    files = list(set(m.file_path for m in matches))
-
     prompt_lines = [
         "## 分析タスク",
         "",
@@ -322,93 +661,147 @@ def generate_claude_code_prompt(
 def generate_markdown_report(
     results: list[ImpactResult],
     codebase_path: str,
-    output_path: Path
+    output_path: Path,
+    generated_at: str | None = None
 ) -> None:
-    """Generate a Markdown impact report."""
-    lines = [
-        "# コードベース影響分析レポート",
-        "",
-        f"**生成日時**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-        f"**対象コードベース**: `{codebase_path}`",
-        f"**分析した破壊的変更数**: {len(results)}",
-        "",
-        "---",
-        "",
-        "## サマリー",
-        "",
-        "| # | 変更内容 | 該当ファイル数 | リスク |",
-        "|---|----------|---------------|--------|",
-    ]
-
-    for i, result in enumerate(results, 1):
-        desc = result.change.get('description', 'N/A')[:50]
-        file_count = len(set(m.file_path for m in result.matches))
-        risk = "⚠️" if file_count > 0 else "✅"
-        lines.append(f"| {i} | {desc}... | {file_count} | {risk} |")
-
-    lines.extend(["", "---", ""])
-
-    # Detailed results
-    for i, result in enumerate(results, 1):
-        change = result.change
-        lines.extend([
-            f"## {i}. {change.get('description', 'N/A')[:80]}",
-            "",
-            f"**バージョン**: {change.get('version', 'N/A')}",
-            f"**カテゴリ**: {change.get('category', 'N/A')}",
-            f"**日本語説明**: {change.get('description_ja', 'N/A')}",
-            f"**推奨対応**: {change.get('replacement', 'N/A')}",
-            "",
-        ])
+    """Generate a Markdown impact report, writing it to the file as it is built.
+
+    generated_at is the header timestamp; main() passes the time the run started.
+    """
+    if generated_at is None:
+        generated_at = time.strftime("%Y-%m-%d %H:%M:%S")
+    # Large buffer: the report is written in many small pieces
+    with open(output_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        w = f.write
+        w(
+            "# コードベース影響分析レポート\n"
+            "\n"
+            f"**生成日時**: {generated_at}\n"
+            f"**対象コードベース**: `{codebase_path}`\n"
+            f"**分析した破壊的変更数**: {len(results)}\n"
+            "\n"
+            "---\n"
+            "\n"
+            "## サマリー\n"
+            "\n"
+            "| # | 変更内容 | 該当ファイル数 | リスク |\n"
+            "|---|----------|---------------|--------|\n"
+        )
 
-        if result.matches:
-            lines.append("### 該当箇所")
-            lines.append("")
-
-            # Group by file
-            files_matches: dict[str, list[CodeMatch]] = {}
-            for match in result.matches:
-                if match.file_path not in files_matches:
-                    files_matches[match.file_path] = []
-                files_matches[match.file_path].append(match)
-
-            for file_path, file_matches in files_matches.items():
-                lines.append(f"#### `{file_path}`")
-                lines.append("")
-
-                # Detect language from file extension
-                lang = get_file_language(file_path)
-
-                for match in file_matches[:5]:  # Limit per file
-                    lines.append(f"**Line {match.line_number}**:")
-                    lines.append(f"```{lang}")
-                    for ctx in match.context_before[-2:]:
-                        lines.append(ctx)
-                    lines.append(f">>> {match.line_content}  // ← 該当行")
-                    for ctx in match.context_after[:2]:
-                        lines.append(ctx)
-                    lines.append("```")
-                    lines.append("")
-
-        if result.ai_analysis:
-            lines.extend([
-                "### AI 分析",
-                "",
-                result.ai_analysis,
-                "",
-            ])
-
-        lines.extend(["---", ""])
-
-    # Write report
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
+        for i, result in enumerate(results, 1):
+            desc = result.change.get('description', 'N/A')[:50]
+            file_count = len(result.affected_files)
+            risk = "⚠️" if file_count > 0 else "✅"
+            w(f"| {i} | {desc}... | {file_count} | {risk} |\n")
+
+        w("\n---\n")
+
+        # Detailed results
+        for i, result in enumerate(results, 1):
+            change = result.change
+            w(
+                "\n"
+                f"## {i}. {change.get('description', 'N/A')[:80]}\n"
+                "\n"
+                f"**バージョン**: {change.get('version', 'N/A')}\n"
+                f"**カテゴリ**: {change.get('category', 'N/A')}\n"
+                f"**日本語説明**: {change.get('description_ja', 'N/A')}\n"
+                f"**推奨対応**: {change.get('replacement', 'N/A')}\n"
+                "\n"
+            )
+
+            if result.matches:
+                w("### 該当箇所\n\n")
+
+                # Group by file, keeping only as many matches per file as are shown
+                files_matches: defaultdict[str, list[CodeMatch]] = defaultdict(list)
+                for match in result.matches:
+                    file_matches = files_matches[match.file_path]
+                    if len(file_matches) < REPORT_MATCHES_PER_FILE:
+                        file_matches.append(match)
+
+                for file_path, file_matches in files_matches.items():
+                    w(f"#### `{file_path}`\n\n")
+
+                    # Detect language from file extension
+                    lang = get_file_language(file_path)
+
+                    for match in file_matches:
+                        w(f"**Line {match.line_number}**:\n```{lang}\n")
+                        for ctx in match.context_before[-2:]:
+                            w(f"{ctx}\n")
+                        w(f">>> {match.line_content}  // ← 該当行\n")
+                        for ctx in match.context_after[:2]:
+                            w(f"{ctx}\n")
+                        w("```\n\n")
+
+            if result.ai_analysis:
+                w(f"### AI 分析\n\n{result.ai_analysis}\n\n")
+
+            w("---\n")
 
     print(f"Report generated: {output_path}", file=sys.stderr)
 
 
+# Multi-source change files: the per-source object and the items to extract from it
+_SOURCE_PREFIX = "item.sources.item"
+_SOURCE_LISTS = ("breaking_changes", "deprecations")
+_ITEM_PREFIXES = {f"{_SOURCE_PREFIX}.{key}.item": key for key in _SOURCE_LISTS}
+
+
+def _stream_source_changes(f) -> list[dict[str, Any]]:
+    """Extract breaking changes and deprecations from a multi-source file with ijson.
+
+    Only one change is materialized at a time; the rest of the document
+    (removed, new_features, ...) is skipped as it streams past.
+    Changes keep the order json.load would give: per source, breaking
+    changes first, then deprecations.
+    """
+    all_breaking = []
+    source: dict[str, list[dict[str, Any]]] = {}
+    builder = None
+    key = ""
+    depth = 0
+
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if builder is not None:
+            # Inside a change: feed events until its closing bracket
+            builder.event(event, value)
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+            if depth == 0:
+                source[key].append(builder.value)
+                builder = None
+        elif prefix in _ITEM_PREFIXES:
+            key = _ITEM_PREFIXES[prefix]
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            depth = 1 if event in ("start_map", "start_array") else 0
+            if depth == 0:
+                source[key].append(builder.value)
+                builder = None
+        elif prefix == _SOURCE_PREFIX:
+            if event == "start_map":
+                source = {key: [] for key in _SOURCE_LISTS}
+            elif event == "end_map":
+                for key in _SOURCE_LISTS:
+                    all_breaking.extend(source[key])
+
+    return all_breaking
+
+
 def load_changes(changes_path: Path | None, data_dir: Path) -> list[dict[str, Any]]:
     """Load breaking changes from file or generate from local TOML."""
+    if changes_path and changes_path.exists() and HAS_IJSON:
+        with open(changes_path, "rb") as f:
+            # Stream multi-source files (a JSON array); anything else is loaded below
+            head = f.read(64).lstrip()
+            f.seek(0)
+            if head.startswith(b"["):
+                return _stream_source_changes(f)
+
     if changes_path and changes_path.exists():
         with open(changes_path, "r", encoding="utf-8") as f:
             data = json.load(f)
@@ -424,16 +817,21 @@ def load_changes(changes_path: Path | None, data_dir: Path) -> list[dict[str, An
             return data
     else:
         # Load from local TOML files
+        if tomllib is None:
+            print("Warning: tomli is required to read local TOML files. Run: uv add tomli", file=sys.stderr)
+            return []
+
         changes = []
-        for toml_file in data_dir.glob("*.toml"):
-            try:
-                import tomllib
-            except ImportError:
-                try:
-                    import tomli as tomllib
-                except ImportError:
-                    continue
+        try:
+            with os.scandir(data_dir) as entries:
+                toml_files = sorted(
+                    entry.path for entry in entries
+                    if entry.name.endswith(".toml") and entry.is_file()
+                )
+        except OSError:
+            toml_files = []
 
+        for toml_file in toml_files:
             with open(toml_file, "rb") as f:
                 data = tomllib.load(f)
                 for change in data.get("changes", []):
@@ -479,8 +877,15 @@ def main():
         default="default",
         help=f"Middleware type for file filtering. Available: {', '.join(MIDDLEWARE_FILE_EXTENSIONS.keys())}"
     )
+    parser.add_argument(
+        "--max-matches",
+        type=int,
+        default=MAX_MATCHES,
+        help=f"Matches kept with context per change; the rest are only counted (default: {MAX_MATCHES})"
+    )
 
     args = parser.parse_args()
+    run_started_at = time.strftime("%Y-%m-%d %H:%M:%S")
 
     # Validate codebase path
     if not args.codebase.exists():
@@ -504,6 +909,16 @@ def main():
 
     print(f"Analyzing {len(changes)} breaking changes...", file=sys.stderr)
 
+    # Search all patterns in one pass over the codebase
+    matches_by_pattern = search_codebase_multi(
+        args.codebase,
+        [change.get("pattern") for change in changes],
+        args.middleware,
+        max_matches=args.max_matches
+    )
+    # Context has been read; release the cached file mappings
+    _line_index.cache_clear()
+
     # Analyze each change
     results: list[ImpactResult] = []
 
@@ -513,28 +928,51 @@ def main():
 
         print(f"[{i}/{len(changes)}] {desc}...", file=sys.stderr)
 
-        # Search codebase with middleware-specific file filtering
-        matches = search_codebase(args.codebase, pattern, args.middleware) if pattern else []
-        print(f"  Found {len(matches)} matches", file=sys.stderr)
+        if not pattern:
+            print("  No search pattern", file=sys.stderr)
+            results.append(ImpactResult(change=change, matches=[]))
+            continue
 
-        # AI analysis
+        hits = matches_by_pattern.get(pattern, [])
+        matches = hits[:args.max_matches]
+        if len(hits) > len(matches):
+            print(f"  Found {len(hits)} matches (showing first {len(matches)})", file=sys.stderr)
+        else:
+            print(f"  Found {len(hits)} matches", file=sys.stderr)
+
+        if not matches:
+            results.append(ImpactResult(change=change, matches=[]))
+            continue
+
+        # Claude Code prompt (API analysis runs in parallel after the loop)
         ai_analysis = ""
-        if matches:
-            if args.ai == "api":
-                print(f"  Analyzing with Claude API...", file=sys.stderr)
-                ai_analysis = analyze_with_claude_api(change, matches, api_key, args.middleware)
-            elif args.ai == "claude-code":
-                ai_analysis = generate_claude_code_prompt(change, matches)
+        if args.ai == "claude-code":
+            ai_analysis = generate_claude_code_prompt(change, matches)
 
         results.append(ImpactResult(
             change=change,
             matches=matches,
             ai_analysis=ai_analysis,
-            affected_files=list(set(m.file_path for m in matches))
+            # Unique files in first-seen order, computed once for the report
+            # (from every hit, so the file count is not cut by the cap)
+            affected_files=list(dict.fromkeys(m.file_path for m in hits))
         ))
 
+    # AI analysis: each request is independent network I/O, so run them in parallel
+    to_analyze = [r for r in results if r.matches] if args.ai == "api" else []
+    if to_analyze:
+        workers = min(AI_WORKERS, len(to_analyze))
+        print(f"Analyzing {len(to_analyze)} changes with Claude API ({workers} parallel)...", file=sys.stderr)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            analyses = executor.map(
+                lambda r: analyze_with_claude_api(r.change, r.matches, api_key, args.middleware),
+                to_analyze
+            )
+            for result, ai_analysis in zip(to_analyze, analyses):
+                result.ai_analysis = ai_analysis
+
     # Generate report
-    generate_markdown_report(results, str(args.codebase), args.output)
+    generate_markdown_report(results, str(args.codebase), args.output, generated_at=run_started_at)
 
     # Summary
     affected_count = sum(1 for r in results if r.matches)
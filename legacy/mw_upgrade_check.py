@@ -7,29 +7,103 @@ Usage:
     uv run mw-upgrade-check [--config=config.toml] [--output=json|text]
 """
 
+from __future__ import annotations
+
 import argparse
+import atexit
+import hashlib
+import http.client
 import json
+import os
 import re
 import sys
-import urllib.request
-import urllib.error
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from html.parser import HTMLParser
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+from urllib.parse import urljoin, urlsplit
 
-# Python 3.11+ has tomllib built-in, fallback for older versions
+# Python 3.11+ has tomllib built-in
 try:
     import tomllib
 except ImportError:
     try:
         import tomli as tomllib
     except ImportError:
-        tomllib = None
+        print("Error: tomli が必要です。`uv add tomli` を実行してください。", file=sys.stderr)
+        sys.exit(1)
 
+# Optional: orjson (Rust JSON serializer, faster than json)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Optional: httpx (HTTP/2 multiplexing when h2 is also installed)
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
 
+try:
+    import h2  # noqa: F401
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
+# Concurrent fetches (one per source and version)
+FETCH_WORKERS = 8
+
+# Serializes progress/error lines written from fetch threads
+_LOG_LOCK = threading.Lock()
+
+# Version strings and UPGRADING section headers
+VERSION_DIGITS_RE = re.compile(r"\d+")
+SECTION_HEADER_RE = re.compile(r"^\d+\.\s*(.+)$")
+
+# UPGRADING section title keyword -> change type
+SECTION_TYPES: dict[str, str] = {
+    "backward incompatible": "breaking",
+    "deprecated": "deprecation",
+    "removed": "removed",
+    "new feature": "new",
+    "new function": "new",
+    "new class": "new",
+    "changed function": "breaking",
+}
+_SECTION_KEY_PRIORITY = {key: i for i, key in enumerate(SECTION_TYPES)}
+# Zero-width lookahead so overlapping keywords are all found in one scan
+SECTION_TYPE_RE = re.compile(
+    "(?=(" + "|".join(re.escape(key) for key in SECTION_TYPES) + "))"
+)
+
+# php.watch section headings
+DEPRECATED_HEADING_RE = re.compile(r"Deprecated", re.IGNORECASE)
+BREAKING_HEADING_RE = re.compile(r"Backward.?Incompatible", re.IGNORECASE)
+PHPWATCH_HEADINGS = (
+    (DEPRECATED_HEADING_RE, "deprecation"),
+    (BREAKING_HEADING_RE, "breaking"),
+)
+
+
+def log(message: str) -> None:
+    """Print a line to stderr without interleaving with other threads."""
+    # One write per line (print() writes the text and the newline separately)
+    line = message + "\n"
+    with _LOG_LOCK:
+        sys.stderr.write(line)
+
+
+@lru_cache(maxsize=256)
 def parse_version(version: str) -> tuple[int, ...]:
     """Parse version string to tuple of integers."""
     version = version.lstrip("^")
-    parts = re.findall(r"\d+", version)
+    parts = VERSION_DIGITS_RE.findall(version)
     return tuple(int(p) for p in parts)
 
 
@@ -45,6 +119,281 @@ def get_target_versions(current: str, target: str) -> list[str]:
     return versions
 
 
+# =============================================================================
+# HTTP Client
+# =============================================================================
+# This script is kept standalone on purpose (installed on its own as
+# mw-upgrade-check), so the HTTP client, HTTP cache and PhpWatchParser are
+# copies of the ones in 2_fetch/run.py. Keep the copies in sync; only
+# http_request() (POST), Cache-Control max-age and the per-run URL memo
+# in cached_get() are specific to this script.
+
+USER_AGENT = "mw-upgrade-check/1.0"
+HTTP_TIMEOUT = 30
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+# Larger responses are rejected rather than held in memory (pages are ~100 KB)
+MAX_RESPONSE_BYTES = 8 * 1024 * 1024
+
+# Exceptions raised by http_get on network failure
+HTTP_ERRORS: tuple[type[Exception], ...] = (OSError, http.client.HTTPException)
+if HAS_HTTPX:
+    HTTP_ERRORS += (httpx.HTTPError,)
+
+# Shared httpx client (thread-safe; one multiplexed connection per host over HTTP/2)
+_httpx_client: "httpx.Client | None" = None
+
+# Idle keep-alive connections, keyed by (scheme, host)
+_connection_pool: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+_pool_lock = threading.Lock()
+
+
+def _new_connection(scheme: str, host: str) -> http.client.HTTPConnection:
+    """Open a new connection to the host."""
+    if scheme == "https":
+        return http.client.HTTPSConnection(host, timeout=HTTP_TIMEOUT)
+    return http.client.HTTPConnection(host, timeout=HTTP_TIMEOUT)
+
+
+def _acquire_connection(scheme: str, host: str) -> tuple[http.client.HTTPConnection, bool]:
+    """Take an idle connection from the pool, or open a new one.
+
+    Returns:
+        tuple: (connection, whether it was reused from the pool)
+    """
+    with _pool_lock:
+        idle = _connection_pool.get((scheme, host))
+        if idle:
+            return idle.pop(), True
+    return _new_connection(scheme, host), False
+
+
+def _release_connection(scheme: str, host: str, conn: http.client.HTTPConnection) -> None:
+    """Return a connection to the pool for reuse."""
+    with _pool_lock:
+        _connection_pool.setdefault((scheme, host), []).append(conn)
+
+
+def close_connections() -> None:
+    """Close all idle pooled connections."""
+    global _httpx_client
+    with _pool_lock:
+        for conns in _connection_pool.values():
+            for conn in conns:
+                conn.close()
+        _connection_pool.clear()
+        if _httpx_client is not None:
+            _httpx_client.close()
+            _httpx_client = None
+
+
+def _get_httpx_client() -> "httpx.Client":
+    """Create the shared httpx client on first use."""
+    global _httpx_client
+    with _pool_lock:
+        if _httpx_client is None:
+            _httpx_client = httpx.Client(
+                http2=HAS_H2,
+                timeout=HTTP_TIMEOUT,
+                headers={"User-Agent": USER_AGENT},
+                follow_redirects=True,
+                max_redirects=MAX_REDIRECTS,
+            )
+        return _httpx_client
+
+
+def http_get(
+    url: str, extra_headers: dict[str, str] | None = None
+) -> tuple[int, str, dict[str, str]]:
+    """GET a URL, reusing connections per host (see http_request)."""
+    return http_request("GET", url, extra_headers)
+
+
+def http_request(
+    method: str,
+    url: str,
+    extra_headers: dict[str, str] | None = None,
+    data: bytes | None = None
+) -> tuple[int, str, dict[str, str]]:
+    """Send a request, reusing connections per host.
+
+    Uses httpx (HTTP/2 if h2 is installed) when available, otherwise
+    http.client with a keep-alive pool. Bodies are read up to
+    MAX_RESPONSE_BYTES; a larger response raises http.client.HTTPException.
+
+    Returns:
+        tuple: (HTTP status code, decoded body, response headers with lowercase names)
+    """
+    if HAS_HTTPX:
+        client = _get_httpx_client()
+        with client.stream(method, url, headers=extra_headers, content=data) as response:
+            body = bytearray()
+            for chunk in response.iter_bytes():
+                body += chunk
+                if len(body) > MAX_RESPONSE_BYTES:
+                    raise http.client.HTTPException(f"Response too large: {url}")
+            return response.status_code, body.decode("utf-8", errors="replace"), dict(response.headers)
+
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+        headers = {"User-Agent": USER_AGENT, **(extra_headers or {})}
+
+        conn, reused = _acquire_connection(parts.scheme, parts.netloc)
+        try:
+            try:
+                conn.request(method, path, body=data, headers=headers)
+                response = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not reused:
+                    raise
+                # The server dropped the idle connection; retry once on a fresh one
+                conn.close()
+                conn = _new_connection(parts.scheme, parts.netloc)
+                conn.request(method, path, body=data, headers=headers)
+                response = conn.getresponse()
+            body = response.read(MAX_RESPONSE_BYTES + 1)
+            if len(body) > MAX_RESPONSE_BYTES:
+                raise http.client.HTTPException(f"Response too large: {url}")
+        except Exception:
+            conn.close()
+            raise
+
+        if response.will_close:
+            conn.close()
+        else:
+            _release_connection(parts.scheme, parts.netloc, conn)
+
+        location = response.getheader("Location")
+        if method == "GET" and response.status in REDIRECT_STATUSES and location:
+            url = urljoin(url, location)
+            continue
+
+        response_headers = {name.lower(): value for name, value in response.getheaders()}
+        return response.status, body.decode("utf-8", errors="replace"), response_headers
+
+    raise http.client.HTTPException(f"Too many redirects: {url}")
+
+
+# =============================================================================
+# HTTP Cache (ETag / Last-Modified, Cache-Control: max-age)
+# =============================================================================
+
+# Shared with 2_fetch
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "mw-auto-updater"
+
+MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+# One fetch per URL per run, shared by every task that asks for it
+# (e.g. several unreleased versions all falling back to master)
+_url_results: dict[str, Future] = {}
+_url_results_lock = threading.Lock()
+
+
+def _cache_path(url: str) -> Path:
+    """Cache file for a URL."""
+    return CACHE_DIR / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+
+def _fresh_until(headers: dict[str, str]) -> float | None:
+    """Time until which a response may be reused without asking the server."""
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return None
+    match = MAX_AGE_RE.search(cache_control)
+    if not match:
+        return None
+    return time.time() + int(match.group(1))
+
+
+def cached_get(url: str) -> tuple[int, str]:
+    """GET a URL once per run; concurrent and later callers share the result.
+
+    Returns:
+        tuple: (HTTP status code, decoded body)
+    """
+    with _url_results_lock:
+        future = _url_results.get(url)
+        owner = future is None
+        if owner:
+            future = _url_results[url] = Future()
+    if not owner:
+        return future.result()
+
+    try:
+        result = _disk_cached_get(url)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    future.set_result(result)
+    return result
+
+
+def _disk_cached_get(url: str) -> tuple[int, str]:
+    """GET a URL, reusing a disk-cached copy when it is still valid.
+
+    A copy within its Cache-Control max-age is used without a request;
+    an older one is revalidated with a conditional request and reused
+    when the server answers 304 Not Modified.
+
+    Returns:
+        tuple: (HTTP status code, decoded body)
+    """
+    cache_file = _cache_path(url)
+    cached = None
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        pass
+    # A copy without a body cannot be reused: fetch unconditionally
+    if not isinstance(cached, dict) or not isinstance(cached.get("body"), str):
+        cached = None
+
+    if cached:
+        fresh_until = cached.get("fresh_until")
+        if isinstance(fresh_until, (int, float)) and fresh_until > time.time():
+            return 200, cached["body"]
+
+    request_headers = {}
+    if cached:
+        if isinstance(cached.get("etag"), str):
+            request_headers["If-None-Match"] = cached["etag"]
+        if isinstance(cached.get("last_modified"), str):
+            request_headers["If-Modified-Since"] = cached["last_modified"]
+
+    status, body, headers = http_get(url, request_headers)
+    if status == 304 and cached:
+        body = cached["body"]
+        etag = cached.get("etag")
+        last_modified = cached.get("last_modified")
+        status = 200
+    else:
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+    fresh_until = _fresh_until(headers)
+
+    if status == 200 and (etag or last_modified or fresh_until):
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({
+                    "url": url,
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "fresh_until": fresh_until,
+                    "body": body,
+                }, f)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            log(f"  [cache] Could not write {cache_file}: {e}")
+
+    return status, body
+
+
 # =============================================================================
 # Source: GitHub (php/php-src UPGRADING)
 # =============================================================================
@@ -55,35 +404,101 @@ def fetch_github_upgrading(version: str) -> list[dict[str, Any]]:
     branch = f"PHP-{version}"
     url = f"https://raw.githubusercontent.com/php/php-src/{branch}/UPGRADING"
 
-    changes = []
+    try:
+        status, content = cached_get(url)
+        if status == 404:
+            log(f"  [github] Branch {branch} not found, trying master...")
+            # Try master for unreleased versions
+            url = "https://raw.githubusercontent.com/php/php-src/master/UPGRADING"
+            status, content = cached_get(url)
+
+        if status != 200:
+            log(f"  [github] HTTP Error {status}: {url}")
+            return []
+
+        return parse_upgrading_content(content, version, url)
+
+    except HTTP_ERRORS as e:
+        log(f"  [github] Error: {e}")
+        return []
+
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+
+def fetch_github_upgrading_batch(versions: list[str]) -> dict[str, list[dict[str, Any]]] | None:
+    """Fetch UPGRADING for every version with one GitHub GraphQL query.
+
+    The GraphQL API needs a token, so this is only used when GITHUB_TOKEN
+    is set. Versions without a release branch get master's UPGRADING, as
+    in fetch_github_upgrading().
+
+    Returns:
+        dict of version -> changes, or None if the query failed and the
+        caller should fetch each version on its own
+    """
+    token = os.environ.get("GITHUB_TOKEN")
+    if not token or not versions:
+        return None
+
+    aliases = {f"v{i}": version for i, version in enumerate(versions)}
+    fields = "".join(
+        f'{alias}: object(expression: "PHP-{version}:UPGRADING") {{ ... on Blob {{ text }} }} '
+        for alias, version in aliases.items()
+    )
+    query = (
+        'query { repository(owner: "php", name: "php-src") { '
+        f'{fields}master: object(expression: "master:UPGRADING") {{ ... on Blob {{ text }} }} '
+        '} }'
+    )
 
     try:
-        req = urllib.request.Request(
-            url,
-            headers={"User-Agent": "mw-upgrade-check/1.0"}
+        status, body, _ = http_request(
+            "POST",
+            GITHUB_GRAPHQL_URL,
+            {"Authorization": f"bearer {token}", "Content-Type": "application/json"},
+            json.dumps({"query": query}).encode("utf-8"),
         )
-        with urllib.request.urlopen(req, timeout=30) as response:
-            content = response.read().decode("utf-8")
-            changes = parse_upgrading_content(content, version, url)
-
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
-            print(f"  [github] Branch {branch} not found, trying master...", file=sys.stderr)
-            # Try master for unreleased versions
-            try:
-                url = "https://raw.githubusercontent.com/php/php-src/master/UPGRADING"
-                req = urllib.request.Request(url, headers={"User-Agent": "mw-upgrade-check/1.0"})
-                with urllib.request.urlopen(req, timeout=30) as response:
-                    content = response.read().decode("utf-8")
-                    changes = parse_upgrading_content(content, version, url)
-            except urllib.error.URLError as e2:
-                print(f"  [github] Error: {e2}", file=sys.stderr)
+        if status != 200:
+            log(f"  [github] GraphQL HTTP Error {status}, fetching versions one by one")
+            return None
+        repository = json.loads(body)["data"]["repository"]
+    except (*HTTP_ERRORS, ValueError, KeyError, TypeError) as e:
+        log(f"  [github] GraphQL error ({e}), fetching versions one by one")
+        return None
+
+    master = repository.get("master") or {}
+    results = {}
+    for alias, version in aliases.items():
+        blob = repository.get(alias)
+        if blob and blob.get("text") is not None:
+            url = f"https://raw.githubusercontent.com/php/php-src/PHP-{version}/UPGRADING"
+            content = blob["text"]
         else:
-            print(f"  [github] HTTP Error: {e}", file=sys.stderr)
-    except urllib.error.URLError as e:
-        print(f"  [github] Error: {e}", file=sys.stderr)
+            log(f"  [github] Branch PHP-{version} not found, using master")
+            url = "https://raw.githubusercontent.com/php/php-src/master/UPGRADING"
+            content = master.get("text")
+            if content is None:
+                results[version] = []
+                continue
+        results[version] = parse_upgrading_content(content, version, url)
+    return results
 
-    return changes
+
+def _github_from_batch(batch: Future, version: str) -> list[dict[str, Any]]:
+    """Take one version's changes from a batch query, fetching it alone if the batch failed."""
+    changes_by_version = batch.result()
+    if changes_by_version is None:
+        return fetch_github_upgrading(version)
+    return changes_by_version[version]
+
+
+def section_type(section_name: str) -> str | None:
+    """Map a lowercased UPGRADING section name to its change type."""
+    keys = SECTION_TYPE_RE.findall(section_name)
+    if not keys:
+        return None
+    return SECTION_TYPES[min(keys, key=_SECTION_KEY_PRIORITY.__getitem__)]
 
 
 def parse_upgrading_content(content: str, version: str, url: str) -> list[dict[str, Any]]:
@@ -92,31 +507,16 @@ def parse_upgrading_content(content: str, version: str, url: str) -> list[dict[s
     current_section = None
     current_subsection = None
 
-    # Section type mapping
-    section_types = {
-        "backward incompatible": "breaking",
-        "deprecated": "deprecation",
-        "removed": "removed",
-        "new feature": "new",
-        "new function": "new",
-        "new class": "new",
-        "changed function": "breaking",
-    }
-
     lines = content.split("\n")
+    line_count = len(lines)
     i = 0
-    while i < len(lines):
+    while i < line_count:
         line = lines[i].strip()
 
         # Detect section headers (e.g., "1. Backward Incompatible Changes")
-        section_match = re.match(r"^\d+\.\s*(.+)$", line)
+        section_match = SECTION_HEADER_RE.match(line)
         if section_match:
-            section_name = section_match.group(1).lower()
-            current_section = None
-            for key, change_type in section_types.items():
-                if key in section_name:
-                    current_section = change_type
-                    break
+            current_section = section_type(section_match.group(1).lower())
             i += 1
             continue
 
@@ -128,12 +528,12 @@ def parse_upgrading_content(content: str, version: str, url: str) -> list[dict[s
 
         # Detect list items with descriptions
         if current_section and line.startswith("- "):
-            description = line[2:].strip()
-
-            # Collect multi-line descriptions
-            while i + 1 < len(lines) and lines[i + 1].startswith("  "):
+            # Collect multi-line descriptions, joined once at the end
+            parts = [line[2:].strip()]
+            while i + 1 < line_count and lines[i + 1].startswith("  "):
                 i += 1
-                description += " " + lines[i].strip()
+                parts.append(lines[i].strip())
+            description = " ".join(parts)
 
             if len(description) > 10:
                 change = {
@@ -156,58 +556,88 @@ def parse_upgrading_content(content: str, version: str, url: str) -> list[dict[s
 # Source: php.watch
 # =============================================================================
 
+class PhpWatchParser(HTMLParser):
+    """Collect list items grouped by the <h2>/<h3> heading they follow."""
+
+    HEADING_TAGS = ("h2", "h3")
+
+    def __init__(self):
+        super().__init__()
+        self.sections: list[tuple[str, list[str]]] = []
+        self._heading: list[str] | None = None
+        self._item: list[str] | None = None
+        self._item_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in self.HEADING_TAGS:
+            self._heading = []
+        elif tag == "li":
+            # Nested <li> text is folded into the outermost item
+            if self._item is None:
+                self._item = []
+            self._item_depth += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self.HEADING_TAGS and self._heading is not None:
+            self.sections.append((_collapse_whitespace(self._heading), []))
+            self._heading = None
+        elif tag == "li" and self._item is not None:
+            self._item_depth -= 1
+            if self._item_depth == 0:
+                if self.sections:
+                    self.sections[-1][1].append(_collapse_whitespace(self._item))
+                self._item = None
+
+    def handle_data(self, data: str) -> None:
+        if self._heading is not None:
+            self._heading.append(data)
+        elif self._item is not None:
+            self._item.append(data)
+
+
+def _collapse_whitespace(parts: list[str]) -> str:
+    """Join text fragments and collapse runs of whitespace."""
+    return " ".join("".join(parts).split())
+
+
 def fetch_phpwatch(version: str) -> list[dict[str, Any]]:
     """Fetch PHP changes from php.watch."""
     url = f"https://php.watch/versions/{version}"
     changes = []
 
     try:
-        req = urllib.request.Request(
-            url,
-            headers={"User-Agent": "mw-upgrade-check/1.0"}
-        )
-        with urllib.request.urlopen(req, timeout=30) as response:
-            html = response.read().decode("utf-8")
-
-            # Look for structured content
-            # php.watch has sections like "Deprecated Features", "New Features", etc.
-
-            # Extract deprecations
-            deprecation_section = re.search(
-                r"Deprecated.*?(?=<h[23]|$)", html, re.DOTALL | re.IGNORECASE
-            )
-            if deprecation_section:
-                items = re.findall(r"<li[^>]*>([^<]+(?:<[^>]+>[^<]*)*)</li>", deprecation_section.group())
-                for item in items[:20]:
-                    clean = re.sub(r"<[^>]+>", "", item).strip()
-                    if len(clean) > 10 and len(clean) < 300:
-                        changes.append({
-                            "version": version,
-                            "type": "deprecation",
-                            "description": clean,
-                            "source": "php.watch",
-                            "source_url": url,
-                        })
-
-            # Extract breaking changes
-            breaking_section = re.search(
-                r"Backward.?Incompatible.*?(?=<h[23]|$)", html, re.DOTALL | re.IGNORECASE
-            )
-            if breaking_section:
-                items = re.findall(r"<li[^>]*>([^<]+(?:<[^>]+>[^<]*)*)</li>", breaking_section.group())
-                for item in items[:20]:
-                    clean = re.sub(r"<[^>]+>", "", item).strip()
-                    if len(clean) > 10 and len(clean) < 300:
-                        changes.append({
-                            "version": version,
-                            "type": "breaking",
-                            "description": clean,
-                            "source": "php.watch",
-                            "source_url": url,
-                        })
-
-    except urllib.error.URLError as e:
-        print(f"  [php.watch] Error fetching {url}: {e}", file=sys.stderr)
+        status, html = cached_get(url)
+        if status != 200:
+            log(f"  [php.watch] HTTP Error {status}: {url}")
+            return changes
+
+        # php.watch has sections like "Deprecated Features", "New Features", etc.
+        # Parse the page once, grouping list items under their heading
+        parser = PhpWatchParser()
+        parser.feed(html)
+        parser.close()
+
+        # One walk over the sections; deprecations are still listed first
+        by_type: dict[str, list[dict[str, Any]]] = {"deprecation": [], "breaking": []}
+        for heading, items in parser.sections:
+            for heading_re, change_type in PHPWATCH_HEADINGS:
+                if not heading_re.search(heading):
+                    continue
+                by_type[change_type].extend(
+                    {
+                        "version": version,
+                        "type": change_type,
+                        "description": item,
+                        "source": "php.watch",
+                        "source_url": url,
+                    }
+                    for item in items
+                    if len(item) > 10 and len(item) < 300
+                )
+        changes = by_type["deprecation"] + by_type["breaking"]
+
+    except HTTP_ERRORS as e:
+        log(f"  [php.watch] Error fetching {url}: {e}")
 
     return changes
 
@@ -216,80 +646,183 @@ def fetch_phpwatch(version: str) -> list[dict[str, Any]]:
 # Source: Local TOML
 # =============================================================================
 
+# Parsed TOML data, reused while the files are unchanged
+# (keyed by absolute file path; written once per run by save_toml_cache)
+TOML_CACHE_FILE = CACHE_DIR / "local-toml.json"
+_toml_cache: dict[str, Any] | None = None
+_toml_cache_dirty = False
+_toml_cache_lock = threading.Lock()
+
+
+def _get_toml_cache() -> dict[str, Any]:
+    """Return the parsed-TOML cache, reading it on first use.
+
+    Must be called with _toml_cache_lock held.
+    """
+    global _toml_cache
+    if _toml_cache is None:
+        try:
+            with open(TOML_CACHE_FILE, encoding="utf-8") as f:
+                _toml_cache = json.load(f)
+        except (OSError, ValueError):
+            _toml_cache = {}
+        if not isinstance(_toml_cache, dict):
+            _toml_cache = {}
+    return _toml_cache
+
+
+def save_toml_cache() -> None:
+    """Write the parsed-TOML cache if this run parsed anything new."""
+    global _toml_cache_dirty
+    with _toml_cache_lock:
+        if not _toml_cache_dirty:
+            return
+        # Leave out entries JSON cannot hold (e.g. TOML dates)
+        entries = {}
+        for key, entry in _toml_cache.items():
+            try:
+                json.dumps(entry)
+            except (TypeError, ValueError):
+                continue
+            entries[key] = entry
+
+        tmp_file = TOML_CACHE_FILE.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_file, TOML_CACHE_FILE)
+        except OSError as e:
+            log(f"  [cache] Could not write {TOML_CACHE_FILE}: {e}")
+            tmp_file.unlink(missing_ok=True)
+        _toml_cache_dirty = False
+
+
+@lru_cache(maxsize=4)
+def _data_index(data_dir: Path) -> dict[str, os.stat_result]:
+    """Scan data_dir once per run: file name -> stat result."""
+    try:
+        with os.scandir(data_dir) as entries:
+            return {entry.name: entry.stat() for entry in entries if entry.is_file()}
+    except OSError:
+        return {}
+
+
+def _load_toml_cached(file_path: Path, st: os.stat_result) -> dict[str, Any]:
+    """Load a TOML file, reusing the parsed copy cached for its mtime and size.
+
+    Anything unexpected in the cache entry counts as a miss.
+    """
+    global _toml_cache_dirty
+    key = str(file_path.resolve())
+    stamp = [st.st_mtime_ns, st.st_size]
+
+    with _toml_cache_lock:
+        entry = _get_toml_cache().get(key)
+    if (
+        isinstance(entry, dict)
+        and entry.get("stamp") == stamp
+        and isinstance(entry.get("data"), dict)
+    ):
+        return entry["data"]
+
+    with open(file_path, "rb") as f:
+        data = tomllib.load(f)
+
+    with _toml_cache_lock:
+        _get_toml_cache()[key] = {"stamp": stamp, "data": data}
+        _toml_cache_dirty = True
+
+    return data
+
+
 def load_local_toml(version: str, data_dir: Path) -> list[dict[str, Any]]:
     """Load changes from local TOML file."""
-    file_path = data_dir / f"php-{version}-changes.toml"
-    if not file_path.exists():
+    file_name = f"php-{version}-changes.toml"
+    st = _data_index(data_dir).get(file_name)
+    if st is None:
         return []
+    file_path = data_dir / file_name
 
-    if tomllib is None:
-        # Fallback: simple TOML parser
-        changes = []
-        current_change = None
-
-        with open(file_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith("#") or not line:
-                    continue
-                if line == "[[changes]]":
-                    if current_change:
-                        current_change["version"] = version
-                        current_change["source"] = "local"
-                        changes.append(current_change)
-                    current_change = {}
-                elif "=" in line and current_change is not None:
-                    key, value = line.split("=", 1)
-                    key = key.strip()
-                    value = value.strip().strip('"').strip("'")
-                    current_change[key] = value
-
-        if current_change:
-            current_change["version"] = version
-            current_change["source"] = "local"
-            changes.append(current_change)
-
-        return changes
-
-    with open(file_path, "rb") as f:
-        data = tomllib.load(f)
-        changes = data.get("changes", [])
-        for change in changes:
-            change["version"] = version
-            change["source"] = "local"
-        return changes
+    # Copies, so the cached data itself is left as parsed
+    data = _load_toml_cached(file_path, st)
+    return [
+        {**change, "version": version, "source": "local"}
+        for change in data.get("changes", [])
+    ]
 
 
 # =============================================================================
 # Main Logic
 # =============================================================================
 
+# Source name -> fetcher(version, data_dir)
+SOURCE_FETCHERS: dict[str, Callable[[str, Path], list[dict[str, Any]]]] = {
+    "github": lambda version, data_dir: fetch_github_upgrading(version),
+    "php.watch": lambda version, data_dir: fetch_phpwatch(version),
+    "local": load_local_toml,
+}
+
+
+def fetch_source_version(source: str, version: str, data_dir: Path) -> list[dict[str, Any]]:
+    """Fetch changes for one version from one source."""
+    fetcher = SOURCE_FETCHERS.get(source)
+    if fetcher is None:
+        log(f"  Unknown source: {source}")
+        return []
+    return fetcher(version, data_dir)
+
+
 def fetch_changes_by_source(
     source: str,
     versions: list[str],
-    data_dir: Path
+    data_dir: Path,
+    pending: dict[tuple[str, str], Future] | None = None
 ) -> dict[str, Any]:
-    """Fetch changes from a specific source for all versions."""
+    """Fetch changes from a specific source for all versions.
+
+    Versions already submitted to a thread pool are taken from `pending`;
+    the rest are fetched on the calling thread.
+    """
+    pending = pending or {}
     all_changes = []
 
     for version in versions:
-        if source == "github":
-            changes = fetch_github_upgrading(version)
-        elif source == "php.watch":
-            changes = fetch_phpwatch(version)
-        elif source == "local":
-            changes = load_local_toml(version, data_dir)
+        future = pending.get((source, version))
+        if future is not None:
+            changes = future.result()
         else:
-            print(f"  Unknown source: {source}", file=sys.stderr)
-            changes = []
+            changes = fetch_source_version(source, version, data_dir)
 
         all_changes.extend(changes)
 
-    # Categorize
-    breaking = [c for c in all_changes if c.get("type") == "breaking"]
-    deprecations = [c for c in all_changes if c.get("type") == "deprecation"]
-    removed = [c for c in all_changes if c.get("type") == "removed"]
-    new_features = [c for c in all_changes if c.get("type") == "new"]
+    # Drop repeated entries (same version, type and description, ignoring
+    # case and whitespace), keeping the first
+    seen: set[tuple[Any, Any, str]] = set()
+    deduped = []
+    for change in all_changes:
+        key = (
+            change.get("version"),
+            change.get("type"),
+            " ".join(str(change.get("description", "")).lower().split()),
+        )
+        if key not in seen:
+            seen.add(key)
+            deduped.append(change)
+    all_changes = deduped
+
+    # Categorize in one pass
+    buckets: dict[str, list[dict[str, Any]]] = {
+        "breaking": [], "deprecation": [], "removed": [], "new": []
+    }
+    for change in all_changes:
+        bucket = buckets.get(change.get("type"))
+        if bucket is not None:
+            bucket.append(change)
+    breaking = buckets["breaking"]
+    deprecations = buckets["deprecation"]
+    removed = buckets["removed"]
+    new_features = buckets["new"]
 
     return {
         "source": source,
@@ -304,7 +837,6 @@ def fetch_changes_by_source(
         "deprecations": deprecations,
         "removed": removed,
         "new_features": new_features,
-        "all_changes": all_changes,
     }
 
 
@@ -317,11 +849,35 @@ def get_php_changes_multi_source(
     """Get PHP changes from multiple sources independently."""
     versions = get_target_versions(current, target)
 
-    results_by_source = []
-    for source in sources:
-        print(f"Fetching from {source}...", file=sys.stderr)
-        result = fetch_changes_by_source(source, versions, data_dir)
-        results_by_source.append(result)
+    # One flat pool for every (source, version), so sources run concurrently
+    # with each other as well as across versions. Local files are cheap but
+    # go through the pool too so all sources take the same path.
+    # A source listed twice is only fetched once.
+    sources = list(dict.fromkeys(sources))
+    tasks = [(source, version) for source in sources for version in versions]
+
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        # With a token, GitHub is asked for all versions in one GraphQL query
+        # (submitted first, so the per-version tasks waiting on it never
+        # hold up its start)
+        github_batch = None
+        if "github" in sources and os.environ.get("GITHUB_TOKEN"):
+            github_batch = executor.submit(fetch_github_upgrading_batch, versions)
+
+        pending = {}
+        for source, version in tasks:
+            if source == "github" and github_batch is not None:
+                pending[(source, version)] = executor.submit(_github_from_batch, github_batch, version)
+            else:
+                pending[(source, version)] = executor.submit(
+                    fetch_source_version, source, version, data_dir
+                )
+
+        results_by_source = []
+        for source in sources:
+            log(f"Fetching from {source}...")
+            result = fetch_changes_by_source(source, versions, data_dir, pending)
+            results_by_source.append(result)
 
     return {
         "middleware": "php",
@@ -334,37 +890,26 @@ def get_php_changes_multi_source(
 
 def load_config(config_path: Path) -> dict[str, Any]:
     """Load TOML configuration file."""
-    if tomllib is None:
-        # Fallback: simple TOML parser
-        config = {"middleware": []}
-        current_mw = None
-
-        with open(config_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith("#") or not line:
-                    continue
-                if line == "[[middleware]]":
-                    current_mw = {"sources": ["local"]}  # default
-                    config["middleware"].append(current_mw)
-                elif "=" in line and current_mw is not None:
-                    key, value = line.split("=", 1)
-                    key = key.strip()
-                    value = value.strip()
-                    # Handle array syntax
-                    if value.startswith("[") and value.endswith("]"):
-                        value = [v.strip().strip('"').strip("'")
-                                for v in value[1:-1].split(",") if v.strip()]
-                    else:
-                        value = value.strip('"').strip("'")
-                    current_mw[key] = value
-
-        return config
-
     with open(config_path, "rb") as f:
         return tomllib.load(f)
 
 
+def write_json_output(data: Any) -> None:
+    """Write data to stdout as indented UTF-8 JSON, using orjson when installed."""
+    if HAS_ORJSON:
+        # orjson produces UTF-8 bytes; write them without a decode/encode round trip
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2) + b"\n")
+        sys.stdout.buffer.flush()
+        return
+    print(json.dumps(data, indent=2, ensure_ascii=False))
+
+
+def _shorten(text: str, width: int = 100) -> str:
+    """Cut text to width characters, marking the cut with "..."."""
+    return text if len(text) <= width else text[:width] + "..."
+
+
 def format_text_output(results: list[dict[str, Any]]) -> str:
     """Format results as human-readable text."""
     lines = []
@@ -390,13 +935,13 @@ def format_text_output(results: list[dict[str, Any]]) -> str:
             if source_result["breaking_changes"]:
                 lines.append(f"\n   ⚠️  BREAKING CHANGES ({source_name}):")
                 for change in source_result["breaking_changes"]:
-                    desc = change['description'][:100] + "..." if len(change['description']) > 100 else change['description']
+                    desc = _shorten(change['description'])
                     lines.append(f"      [{change.get('version', '?')}] {desc}")
 
             if source_result["deprecations"]:
                 lines.append(f"\n   ⚡ DEPRECATIONS ({source_name}):")
                 for change in source_result["deprecations"]:
-                    desc = change['description'][:100] + "..." if len(change['description']) > 100 else change['description']
+                    desc = _shorten(change['description'])
                     lines.append(f"      [{change.get('version', '?')}] {desc}")
                     if change.get("replacement"):
                         lines.append(f"         → {change['replacement']}")
@@ -424,6 +969,8 @@ def main():
 
     args = parser.parse_args()
 
+    atexit.register(close_connections)
+
     # Resolve paths
     script_dir = Path(__file__).parent.resolve()
     config_path = Path(args.config)
@@ -453,7 +1000,7 @@ def main():
             sources = [sources]
 
         if not all([name, current, target]):
-            print(f"Warning: Skipping incomplete middleware config: {mw}", file=sys.stderr)
+            log(f"Warning: Skipping incomplete middleware config: {mw}")
             continue
 
         if name == "php":
@@ -465,13 +1012,15 @@ def main():
             )
             results.append(result)
         else:
-            print(f"Warning: Unsupported middleware: {name}", file=sys.stderr)
+            log(f"Warning: Unsupported middleware: {name}")
+
+    save_toml_cache()
 
     # Output results
     if args.output == "json":
-        print(json.dumps(results, indent=2, ensure_ascii=False))
+        write_json_output(results)
     else:
-        print(format_text_output(results))
+        sys.stdout.write(format_text_output(results) + "\n")
 
 
 if __name__ == "__main__":